@@ -1131,6 +1131,7 @@ class Game:
                 # Simulate time progression (1 minute = 1 real second)
                 virtual_hour = (self.game_time * 0.016) % 24
                 self.dynamic_lighting.update_time_of_day(virtual_hour)
+                self.dynamic_lighting.update_spotlight_culling(getattr(self.app, 'cam', None))
             else:
                 logging.debug("Dynamic lighting not available")
 
@@ -91,7 +91,7 @@ class SimpleSkyDome:
     def _setup_sky(self):
         """Set up the sky dome."""
         # Get sky texture
-        texture = create_sky_texture()
+        texture = create_sky_texture(app=self.app)
         
         # Set background color
         if hasattr(self.app, 'setBackgroundColor'):
@@ -4,7 +4,6 @@ Handles textures, materials, lighting, weather, foliage, and post-processing.
 """
 
 from graphics.texture_factory import (
-    TextureFactory,
     create_crosshair_texture,
     create_icon_texture,
     get_ui_panel_texture,
@@ -20,7 +19,6 @@ from graphics.post_processing import PostProcessing, CinematicEffects
 from graphics.settings_manager import GraphicsSettingsManager, create_optimized_graphics
 
 __all__ = [
-    'TextureFactory',
     'create_crosshair_texture',
     'create_icon_texture',
     'get_ui_panel_texture',
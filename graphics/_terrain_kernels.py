@@ -0,0 +1,26 @@
+"""
+Optional Numba-compiled kernels for terrain material classification.
+`classify` is None when Numba is not installed; callers fall back to NumPy.
+"""
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+if numba is not None:
+    @numba.njit(parallel=True, cache=True, fastmath=True)
+    def classify(heights, moistures, out):
+        """Write material indices for flat height/moisture arrays into `out`."""
+        for i in numba.prange(heights.shape[0]):
+            if heights[i] > 2.0:
+                out[i] = 3
+            elif heights[i] > 0.5:
+                out[i] = 1
+            elif moistures[i] > 0.7:
+                out[i] = 2
+            else:
+                out[i] = 0
+else:
+    classify = None
@@ -0,0 +1,136 @@
+"""
+Optional Numba-compiled kernels for the procedural sprite textures.
+Each kernel fills float32 image arrays indexed [y, x] in place. They are None
+when Numba is not installed; callers fall back to NumPy.
+"""
+
+import math
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+# Must match texture_factory's hash table, which wraps every 1024 pixels
+_HASH_MASK = 1023
+
+
+if numba is not None:
+    # No fastmath: the hash amplifies rounding in the sine argument, so the
+    # arithmetic has to stay exactly as NumPy evaluates it
+    @numba.njit(cache=True, nogil=True)
+    def _hash_noise(x, y):
+        x &= _HASH_MASK
+        y &= _HASH_MASK
+        value = math.sin(y * 78.233 + x * 12.9898) * 43758.5453
+        # fmod(value, 1.0), which Numba lacks; subtracting the truncated
+        # integer part is exact, so this rounds the same as NumPy's fmod
+        value -= math.trunc(value)
+        return numba.float32((value + 1.0) % 1.0)
+
+    @numba.njit(parallel=True, cache=True, fastmath=True, nogil=True)
+    def leaf(rgb, t):
+        """Round leaf disc: color into `rgb`, distance over disc radius into `t`."""
+        size = rgb.shape[0]
+        center = size / 2.0
+        radius = size * 0.45
+        for y in numba.prange(size):
+            for x in range(size):
+                dx = x - center
+                dy = y - center
+                r = math.sqrt(dx * dx + dy * dy) / radius
+                t[y, x] = r
+                if r > 1.0:
+                    rgb[y, x, 0] = 0.0
+                    rgb[y, x, 1] = 0.0
+                    rgb[y, x, 2] = 0.0
+                    continue
+                noise = (_hash_noise(x, y) - 0.5) * 0.06
+                rgb[y, x, 0] = 0.08 + 0.04 * r + noise
+                rgb[y, x, 1] = 0.32 + 0.06 * r + noise
+                rgb[y, x, 2] = 0.05 + 0.03 * r + noise
+
+    @numba.njit(parallel=True, cache=True, fastmath=True, nogil=True)
+    def flower_patch(out, palette):
+        """Grassy disc with scattered petals picked from `palette` (n x 3)."""
+        size = out.shape[0]
+        center = size / 2.0
+        radius = size * 0.48
+        count = palette.shape[0]
+        for y in numba.prange(size):
+            for x in range(size):
+                dx = x - center
+                dy = y - center
+                dist = math.sqrt(dx * dx + dy * dy)
+                if dist > radius:
+                    out[y, x, 0] = 0.0
+                    out[y, x, 1] = 0.0
+                    out[y, x, 2] = 0.0
+                    out[y, x, 3] = 0.0
+                    continue
+                falloff = 1.0 - dist / radius
+                base = 0.18 + falloff * 0.22
+                noise = (_hash_noise(x, y) - 0.5) * 0.05
+                out[y, x, 0] = base * 0.6 + noise
+                out[y, x, 1] = 0.3 + base * 0.8 + noise * 1.2
+                out[y, x, 2] = base * 0.45 + noise * 0.6
+                out[y, x, 3] = 0.75 + falloff * 0.2
+                if dist <= radius * 0.96:
+                    highlight = _hash_noise(x + size, y - size)
+                    if highlight > 0.87:
+                        petal = int(highlight * count) % count
+                        out[y, x, 0] = palette[petal, 0]
+                        out[y, x, 1] = palette[petal, 1]
+                        out[y, x, 2] = palette[petal, 2]
+                        out[y, x, 3] = 0.98
+
+    @numba.njit(parallel=True, cache=True, fastmath=True, nogil=True)
+    def water(out):
+        """Circular water surface with concentric ripples."""
+        size = out.shape[0]
+        center = size / 2.0
+        for y in numba.prange(size):
+            for x in range(size):
+                dx = (x - center) / center
+                dy = (y - center) / center
+                r = math.sqrt(dx * dx + dy * dy)
+                if r > 1.0:
+                    out[y, x, 0] = 0.0
+                    out[y, x, 1] = 0.0
+                    out[y, x, 2] = 0.0
+                    out[y, x, 3] = 0.0
+                    continue
+                ripple = math.sin(r * 14.0) * 0.03 + (_hash_noise(x, y) - 0.5) * 0.02
+                out[y, x, 0] = 0.08 + 0.04 * r + ripple
+                out[y, x, 1] = 0.21 + 0.14 * r + ripple
+                out[y, x, 2] = 0.32 + 0.16 * r + ripple
+                out[y, x, 3] = max(0.25, 1.0 - r * 0.7)
+
+    @numba.njit(parallel=True, cache=True, fastmath=True, nogil=True)
+    def track(out):
+        """Soft-edged hoofprint depression."""
+        size = out.shape[0]
+        center = size / 2.0
+        for y in numba.prange(size):
+            for x in range(size):
+                dx = (x - center) / center
+                dy = (y - center) / center
+                dist = math.sqrt(dx * dx + dy * dy)
+                if dist > 1.0:
+                    out[y, x, 0] = 0.0
+                    out[y, x, 1] = 0.0
+                    out[y, x, 2] = 0.0
+                    out[y, x, 3] = 0.0
+                    continue
+                depth = (1.0 - dist) ** 2
+                color = 0.25 + depth * 0.45
+                out[y, x, 0] = color
+                out[y, x, 1] = color * 0.75
+                out[y, x, 2] = 0.28
+                out[y, x, 3] = min(1.0, depth * 2.5)
+else:
+    leaf = None
+    flower_patch = None
+    water = None
+    track = None
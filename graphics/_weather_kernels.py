@@ -0,0 +1,34 @@
+"""
+Optional Numba-compiled kernel for the CPU precipitation fallback.
+`step_precipitation` is None when Numba is not installed; callers fall back to NumPy.
+"""
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+if numba is not None:
+    @numba.njit(parallel=True, cache=True, fastmath=True, nogil=True)
+    def step_precipitation(pos, offsets, verts, drop, ceiling, radius):
+        """Lower every particle by `drop`, respawn landed ones and rebuild `verts`.
+
+        `pos` is (N, 3), `offsets` the (K, 3) vertex offsets of one particle
+        and `verts` the (N, K, 3) output, all float32.
+        """
+        for i in numba.prange(pos.shape[0]):
+            z = pos[i, 2] - drop
+            if z < -1.0:
+                z = ceiling
+                pos[i, 0] = np.random.uniform(-radius, radius)
+                pos[i, 1] = np.random.uniform(-radius, radius)
+            pos[i, 2] = z
+            for k in range(offsets.shape[0]):
+                verts[i, k, 0] = pos[i, 0] + offsets[k, 0]
+                verts[i, k, 1] = pos[i, 1] + offsets[k, 1]
+                verts[i, k, 2] = z + offsets[k, 2]
+else:
+    step_precipitation = None
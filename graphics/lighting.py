@@ -5,7 +5,7 @@ Advanced lighting system with dynamic time, volumetric effects, and photorealist
 from panda3d.core import (
     DirectionalLight, AmbientLight, PointLight, Spotlight,
     Vec4, Vec3, Fog, LVector3, NodePath, ShaderGenerator, 
-    RenderState, Material
+    RenderState, Material, BoundingSphere, BoundingVolume
 )
 import math
 import random
@@ -36,6 +36,11 @@ class DynamicLighting:
         self.rim_light_base_color = None
         self.debug_visualizer = None
 
+        # Spotlights are culled against the camera frustum every few frames
+        self._spotlights = []
+        self._spotlight_cull_interval = 4
+        self._spotlight_cull_frame = 0
+
     def setup_advanced_lighting(self):
         """Set up photorealistic lighting system with PBR support."""
         if self.is_setup:
@@ -183,16 +188,23 @@ class DynamicLighting:
         self.ambient_light.setColor(sky_color)
         self.sky_ambient.setColor(base_ambient)
     
-    def add_spotlight(self, position, direction, color=(1.0, 1.0, 1.0, 1.0)):
-        """Add a dynamic spotlight (for flashlights, etc)."""
+    def add_spotlight(self, position, direction, color=(1.0, 1.0, 1.0, 1.0), light_range=50.0):
+        """Add a dynamic spotlight (for flashlights, etc).
+
+        The light reaches ``light_range`` units along its cone and no further;
+        the same range bounds the cone for frustum culling.
+        """
         spot = Spotlight('dynamic_spot')
         spot.setColor(Vec4(*color))
+        spot.setMaxDistance(light_range)
+        spot.getLens().setNearFar(0.1, light_range)
         
         spot_np = self.render.attachNewNode(spot)
         spot_np.setPos(position)
         spot_np.setHpr(direction[0], direction[1], direction[2])
 
         self.render.setLight(spot_np)
+        self._spotlights.append((spot_np, spot))
 
         if self.debug_visualizer:
             lens = spot.getLens()
@@ -201,6 +213,52 @@ class DynamicLighting:
             self.debug_visualizer.create_cone_geometry(spot_np, fov, range_val)
 
         return spot_np
+
+    def remove_spotlight(self, spot_np):
+        """Remove a spotlight created by add_spotlight."""
+        self._spotlights = [entry for entry in self._spotlights if entry[0] != spot_np]
+        self.render.clearLight(spot_np)
+        spot_np.removeNode()
+
+    def update_spotlight_culling(self, camera_np):
+        """Only light the scene with spotlights whose cone reaches the view frustum."""
+        if not self._spotlights or camera_np is None:
+            return
+
+        self._spotlight_cull_frame += 1
+        if self._spotlight_cull_frame < self._spotlight_cull_interval:
+            return
+        self._spotlight_cull_frame = 0
+
+        frustum = camera_np.node().getLens().makeBounds()
+        frustum.xform(camera_np.getMat(self.render))
+
+        for spot_np, spot in self._spotlights:
+            if spot_np.isEmpty():
+                continue
+            visible = frustum.contains(self._spotlight_bounds(spot_np, spot)) != BoundingVolume.IF_no_intersection
+            if visible and not self.render.hasLight(spot_np):
+                self.render.setLight(spot_np)
+            elif not visible and self.render.hasLight(spot_np):
+                self.render.clearLight(spot_np)
+
+    def _spotlight_bounds(self, spot_np, spot):
+        """Return the smallest world-space sphere enclosing a spotlight's cone."""
+        lens = spot.getLens()
+        apex = spot_np.getPos(self.render)
+        axis = spot_np.getQuat(self.render).getForward()
+        range_val = lens.getFar()
+        half_fov = math.radians(lens.getFov()[0] / 2.0)
+
+        if half_fov < math.pi / 4:
+            # Narrow cone: sphere passes through the apex and the base rim
+            radius = range_val / (2.0 * math.cos(half_fov) ** 2)
+            center = apex + axis * radius
+        else:
+            # Wide cone: the base disc dominates
+            radius = range_val * math.tan(half_fov)
+            center = apex + axis * range_val
+        return BoundingSphere(center, radius)
     
     def adjust_for_weather(self, rain_intensity=0.0, fog_density=0.0):
         """Adjust lighting for weather conditions."""
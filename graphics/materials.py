@@ -3,12 +3,51 @@ PBR Materials System for realistic terrain, objects, and environment rendering.
 Implements Physically Based Rendering for photorealistic graphics.
 """
 
-from panda3d.core import Material, TextureStage, NodePath, LVector3, LVector4
+from panda3d.core import Material, TextureStage, NodePath, LVector4
+from collections.abc import Mapping
+from typing import Dict
+import functools
 import math
 
+import numpy as np
+
+from graphics._terrain_kernels import classify as _classify_kernel
+
+
+# Shared materials keyed by quantized parameters (see PBRMaterial.get)
+_MATERIAL_CACHE: Dict[int, 'PBRMaterial'] = {}
+
+# Dielectric specular reflectance (F0) indexed by metallic quantized to 0..255
+_NONMETAL_F0 = tuple(0.04 * (1.0 - m / 255.0) + m / 255.0 for m in range(256))
+# Matching specular colors, built once and shared; treat as read-only
+_F0_VECS = tuple(LVector4(f0, f0, f0, 1.0) for f0 in _NONMETAL_F0)
+
+# Number of discrete wave states used for dynamic water materials
+WATER_WAVE_BUCKETS = 16
+
+# Number of discrete wind states used for windblown leaf materials
+WIND_ROUGHNESS_BUCKETS = 16
+# Wind strength at which leaf roughness saturates at 1.0
+MAX_WIND_STRENGTH = 3.0
+
+
+def _material_key(base_color, metallic, roughness, normal_scale):
+    """Pack material parameters into a single int cache key.
+
+    Color channels, metallic and roughness (all 0..1) are quantized to 8 bits
+    each; normal scale takes the low 16 bits in the same 1/255 steps.
+    """
+    r, g, b, a = base_color
+    return ((int(r * 255 + 0.5) << 56) | (int(g * 255 + 0.5) << 48)
+            | (int(b * 255 + 0.5) << 40) | (int(a * 255 + 0.5) << 32)
+            | (int(metallic * 255 + 0.5) << 24) | (int(roughness * 255 + 0.5) << 16)
+            | int(normal_scale * 255 + 0.5))
+
 
 class PBRMaterial:
     """Physically Based Rendering material with metallic, roughness, and normal maps."""
+
+    __slots__ = ('material', 'base_color', 'metallic', 'roughness', 'normal_scale', '_shininess', '_spec')
     
     def __init__(self, base_color=(1, 1, 1, 1), metallic=0.0, roughness=1.0, normal_scale=1.0):
         self.material = Material()
@@ -17,6 +56,21 @@ class PBRMaterial:
         self.roughness = roughness
         self.normal_scale = normal_scale
         self._setup_material()
+
+    @classmethod
+    def get(cls, base_color=(1, 1, 1, 1), metallic=0.0, roughness=1.0, normal_scale=1.0):
+        """Return a shared material for these parameters, creating it on first use.
+
+        Parameters are quantized to 1/255 steps for lookup, so near-identical
+        requests share one material. Materials returned here are shared between
+        callers and must not be mutated.
+        """
+        key = _material_key(base_color, metallic, roughness, normal_scale)
+        material = _MATERIAL_CACHE.get(key)
+        if material is None:
+            material = cls(base_color, metallic, roughness, normal_scale)
+            _MATERIAL_CACHE[key] = material
+        return material
     
     def _setup_material(self):
         """Set up the PBR material properties."""
@@ -25,19 +79,36 @@ class PBRMaterial:
         self.material.setAmbient(self.base_color)
         
         # Handle metallic/roughness workflow
-        # Convert roughness to glossiness for Panda3D
-        gloss = max(0.001, 1.0 - self.roughness)
-        self.material.setShininess(128 * gloss)
+        self._shininess = self._roughness_to_shininess(self.roughness)
+        self.material.setShininess(self._shininess)
         
         # Calculate specular based on metallic workflow
         if self.metallic > 0.5:
             # Metallic materials have colored specular
-            spec_color = LVector3(*self.base_color[:3]) * self.metallic
-            self.material.setSpecular(LVector4(spec_color[0], spec_color[1], spec_color[2], 1.0))
+            r, g, b = self.base_color[:3]
+            m = self.metallic
+            self._spec = LVector4(r * m, g * m, b * m, 1.0)
         else:
             # Non-metallic materials use standard specular
-            spec_strength = 0.04 * (1.0 - self.metallic) + self.metallic
-            self.material.setSpecular(LVector4(spec_strength, spec_strength, spec_strength, 1.0))
+            self._spec = _F0_VECS[int(self.metallic * 255 + 0.5)]
+        self.material.setSpecular(self._spec)
+
+    @staticmethod
+    def _roughness_to_shininess(roughness):
+        """Convert roughness to Panda3D shininess via glossiness."""
+        gloss = max(0.001, 1.0 - roughness)
+        return 128 * gloss
+
+    def set_roughness(self, roughness):
+        """Change roughness, touching only the shininess of the underlying material.
+
+        Do not call this on materials obtained from PBRMaterial.get(); they are shared.
+        """
+        if abs(roughness - self.roughness) <= 1e-3:
+            return
+        self.roughness = roughness
+        self._shininess = self._roughness_to_shininess(roughness)
+        self.material.setShininess(self._shininess)
     
     def apply_to(self, node_path):
         """Apply this PBR material to a NodePath."""
@@ -53,7 +124,7 @@ class TerrainPBR:
     def setup_terrain_materials(self):
         """Create realistic terrain materials using PBR principles."""
         # Forest floor material
-        self.forest_floor = PBRMaterial(
+        self.forest_floor = PBRMaterial.get(
             base_color=(0.22, 0.15, 0.08, 1.0),  # Dark brown
             metallic=0.0,
             roughness=0.9,  # Very rough
@@ -61,7 +132,7 @@ class TerrainPBR:
         )
         
         # Rocky terrain material  
-        self.rocks = PBRMaterial(
+        self.rocks = PBRMaterial.get(
             base_color=(0.38, 0.38, 0.40, 1.0),  # Gray rock
             metallic=0.1,
             roughness=0.7,  # Moderately rough
@@ -69,7 +140,7 @@ class TerrainPBR:
         )
         
         # Wet mud material
-        self.wet_mud = PBRMaterial(
+        self.wet_mud = PBRMaterial.get(
             base_color=(0.15, 0.10, 0.08, 1.0),  # Dark muddy brown
             metallic=0.0,
             roughness=0.5,  # Smoother when wet
@@ -77,23 +148,46 @@ class TerrainPBR:
         )
         
         # Snow material
-        self.snow = PBRMaterial(
+        self.snow = PBRMaterial.get(
             base_color=(0.98, 0.99, 1.0, 1.0),  # Pure white
             metallic=0.0,
             roughness=0.3,  # Smooth but not glossy
             normal_scale=0.5
         )
+
+        # Lookup table indexed by classify_materials()
+        self._materials = [self.forest_floor, self.rocks, self.wet_mud, self.snow]
     
+    def classify_materials(self, heights: np.ndarray, moistures: np.ndarray) -> np.ndarray:
+        """Classify many terrain cells at once.
+
+        Returns a uint8 array of indices into ``self._materials``:
+        0 = forest floor, 1 = rocks, 2 = wet mud, 3 = snow.
+        """
+        heights, moistures = np.broadcast_arrays(np.asarray(heights), np.asarray(moistures))
+        if _classify_kernel is not None:
+            out = np.empty(heights.size, dtype=np.uint8)
+            _classify_kernel(
+                np.ascontiguousarray(heights, dtype=np.float64).ravel(),
+                np.ascontiguousarray(moistures, dtype=np.float64).ravel(),
+                out,
+            )
+            return out.reshape(heights.shape)
+        idx = np.where(heights > 2.0, 3,
+                       np.where(heights > 0.5, 1,
+                                np.where(moistures > 0.7, 2, 0)))
+        return idx.astype(np.uint8)
+
     def get_material_for_height(self, height, moisture=0.0):
         """Return appropriate material based on terrain height and moisture."""
         if height > 2.0:
-            return self.snow
+            return self._materials[3]
         elif height > 0.5:
-            return self.rocks
+            return self._materials[1]
         elif moisture > 0.7:
-            return self.wet_mud
+            return self._materials[2]
         else:
-            return self.forest_floor
+            return self._materials[0]
 
 
 class EnvironmentMaterials:
@@ -104,42 +198,20 @@ class EnvironmentMaterials:
     
     def setup_natural_materials(self):
         """Set up materials for trees, water, and other natural elements."""
-        # Tree bark material
-        self.tree_bark = PBRMaterial(
-            base_color=(0.15, 0.08, 0.04, 1.0),  # Dark brown
-            metallic=0.0,
-            roughness=0.95,  # Very rough
-            normal_scale=1.5
-        )
-        
-        # Leaves material
-        self.leaves = PBRMaterial(
-            base_color=(0.1, 0.3, 0.05, 1.0),  # Green leaves
-            metallic=0.0,
-            roughness=0.6,  # Moderately rough
-            normal_scale=0.8
-        )
-        
-        # Water material (dynamic)
-        self.water_static = PBRMaterial(
-            base_color=(0.2, 0.3, 0.5, 1.0),  # Blue water
-            metallic=0.5,
-            roughness=0.2,  # Smooth
-            normal_scale=0.3
-        )
-        
-        # Grass material
-        self.grass = PBRMaterial(
-            base_color=(0.1, 0.4, 0.05, 1.0),  # Green grass
-            metallic=0.0,
-            roughness=0.8,  # Rough
-            normal_scale=0.6
-        )
+        # Shared with the matching entries in MATERIAL_PRESETS
+        self.tree_bark = get_preset('tree_bark')
+        self.leaves = get_preset('leaves')
+        self.water_static = get_preset('water')
+        self.grass = get_preset('grass')
         
     def get_dynamic_water_material(self, wave_intensity):
         """Get water material that changes with wave conditions."""
+        # Snap to a fixed number of wave states so materials are shared
+        steps = WATER_WAVE_BUCKETS - 1
+        bucket = int(min(1.0, max(0.0, wave_intensity)) * steps + 0.5)
+        wave_intensity = bucket / steps
         roughness = 0.2 + (wave_intensity * 0.3)  # Waves increase roughness
-        return PBRMaterial(
+        return PBRMaterial.get(
             base_color=(0.2, 0.3, 0.5, 1.0),
             metallic=0.4,
             roughness=roughness,
@@ -151,26 +223,33 @@ class FoliageMaterial:
     """Specialized material for animated foliage."""
     
     def __init__(self):
-        self.leaf_material = PBRMaterial(
-            base_color=(0.1, 0.3, 0.05, 1.0),
-            metallic=0.0,
-            roughness=0.7,
-            normal_scale=0.5
-        )
-        self.grass_material = PBRMaterial(
+        self.grass_material = PBRMaterial.get(
             base_color=(0.1, 0.4, 0.05, 1.0),
             metallic=0.0,
             roughness=0.8,
             normal_scale=0.3
         )
+        # Windblown variants of the leaf material, one per wind bucket
+        steps = WIND_ROUGHNESS_BUCKETS - 1
+        self.wind_leaf_materials = [
+            PBRMaterial.get(
+                base_color=(0.1, 0.3, 0.05, 1.0),
+                metallic=0.0,
+                roughness=0.7 + (MAX_WIND_STRENGTH * i / steps) * 0.1,
+                normal_scale=0.5
+            )
+            for i in range(WIND_ROUGHNESS_BUCKETS)
+        ]
+        # The calm-air bucket is the plain leaf material
+        self.leaf_material = self.wind_leaf_materials[0]
     
     def apply_with_wind(self, node_path, wind_strength=0.0):
         """Apply material with wind animation considerations."""
-        # Adjust roughness based on wind (wet leaves are shinier when windblown)
-        roughness = 0.7 + (wind_strength * 0.1)
-        self.leaf_material.roughness = roughness
-        self.leaf_material._setup_material()
-        self.leaf_material.apply_to(node_path)
+        # Adjust roughness based on wind (wet leaves are shinier when windblown).
+        # Roughness saturates at 1.0 once wind reaches MAX_WIND_STRENGTH.
+        wind = min(MAX_WIND_STRENGTH, max(0.0, wind_strength))
+        bucket = int(wind / MAX_WIND_STRENGTH * (WIND_ROUGHNESS_BUCKETS - 1) + 0.5)
+        self.wind_leaf_materials[bucket].apply_to(node_path)
 
 
 # Import fixes for circular references
@@ -183,15 +262,39 @@ def import_main_app():
         return None
 
 
-# Predefined material presets for common elements
-MATERIAL_PRESETS = {
-    'dirt': PBRMaterial((0.3, 0.2, 0.1, 1.0), 0.0, 0.9),
-    'rock': PBRMaterial((0.4, 0.4, 0.45, 1.0), 0.1, 0.7),
-    'grass': PBRMaterial((0.1, 0.4, 0.05, 1.0), 0.0, 0.8),
-    'tree_bark': PBRMaterial((0.15, 0.08, 0.04, 1.0), 0.0, 0.95),
-    'leaves': PBRMaterial((0.1, 0.3, 0.05, 1.0), 0.0, 0.6),
-    'water': PBRMaterial((0.2, 0.3, 0.5, 1.0), 0.5, 0.2),
-    'snow': PBRMaterial((0.95, 0.98, 1.0, 1.0), 0.0, 0.3),
-    'metal_gun': PBRMaterial((0.2, 0.22, 0.25, 1.0), 0.8, 0.4),
-    'wood_gun': PBRMaterial((0.4, 0.25, 0.1, 1.0), 0.0, 0.6),
+# Predefined material presets for common elements:
+# (base_color, metallic, roughness, normal_scale)
+_PRESET_SPECS = {
+    'dirt': ((0.3, 0.2, 0.1, 1.0), 0.0, 0.9, 1.0),
+    'rock': ((0.4, 0.4, 0.45, 1.0), 0.1, 0.7, 1.0),
+    'grass': ((0.1, 0.4, 0.05, 1.0), 0.0, 0.8, 0.6),
+    'tree_bark': ((0.15, 0.08, 0.04, 1.0), 0.0, 0.95, 1.5),
+    'leaves': ((0.1, 0.3, 0.05, 1.0), 0.0, 0.6, 0.8),
+    'water': ((0.2, 0.3, 0.5, 1.0), 0.5, 0.2, 0.3),
+    'snow': ((0.95, 0.98, 1.0, 1.0), 0.0, 0.3, 1.0),
+    'metal_gun': ((0.2, 0.22, 0.25, 1.0), 0.8, 0.4, 1.0),
+    'wood_gun': ((0.4, 0.25, 0.1, 1.0), 0.0, 0.6, 1.0),
 }
+
+
+@functools.lru_cache(maxsize=None)
+def get_preset(name):
+    """Return the shared preset material with the given name, building it on first use."""
+    spec = _PRESET_SPECS[name]
+    return PBRMaterial.get(*spec)
+
+
+class _MaterialPresets(Mapping):
+    """Read-only mapping that builds preset materials lazily."""
+
+    def __getitem__(self, name):
+        return get_preset(name)
+
+    def __iter__(self):
+        return iter(_PRESET_SPECS)
+
+    def __len__(self):
+        return len(_PRESET_SPECS)
+
+
+MATERIAL_PRESETS = _MaterialPresets()
@@ -3,12 +3,229 @@ Post-processing effects for photorealistic rendering.
 Provides bloom, SSAO, anti-aliasing, and other visual enhancements.
 """
 
+from collections import defaultdict
+import functools
+import math
+import random
+
+from direct.showbase.DirectObject import DirectObject
 from direct.showbase.ShowBase import ShowBase
 from panda3d.core import (
-    WindowProperties, FrameBufferProperties, Texture, GraphicsOutput,
-    Camera, NodePath, TextureAttrib, RenderState, Shader, CardMaker
+    FrameBufferProperties, Texture, GraphicsOutput, Shader, CardMaker,
+    TransparencyAttrib, NodePath, Camera, OrthographicLens, PNMImage,
+    PTA_LVecBase4f, LVecBase4f
+)
+
+
+# Shared vertex shader for every fullscreen post-processing quad
+_FULLSCREEN_VERT = """
+#version 120
+void main() {
+    gl_Position = ftransform();
+    gl_TexCoord[0] = gl_MultiTexCoord0;
+}
+"""
+
+# Bloom: a bright pass writes max(color - threshold, 0) into a half-res
+# buffer, a horizontal blur runs on that, and the composite pass does the
+# vertical blur while upsampling the glow over the scene.
+BLOOM_DOWNSAMPLE = 2
+
+_BRIGHT_PASS_FRAG = """
+#version 120
+uniform sampler2D tex;
+uniform float threshold;
+void main() {
+    vec4 c = texture2D(tex, gl_TexCoord[0].st);
+    gl_FragColor = max(c - vec4(threshold), vec4(0.0));
+}
+"""
+
+_BLOOM_H_FRAG = """
+#version 120
+uniform sampler2D tex;
+const float STEP = 0.005;
+const float WEIGHTS[5] = float[5](0.07, 0.24, 0.38, 0.24, 0.07);
+void main() {
+    vec2 uv = gl_TexCoord[0].st;
+    vec4 glow = vec4(0);
+    for (int i = 0; i < 5; i++) {
+        glow += texture2D(tex, uv + vec2(float(i - 2) * STEP, 0.0)) * WEIGHTS[i];
+    }
+    gl_FragColor = glow;
+}
+"""
+
+# Final composite pass. Bloom, SSAO, FXAA and motion blur are fused into one
+# fullscreen shader; each enabled effect adds a #define ahead of this body.
+EFFECT_BLOOM = 1
+EFFECT_SSAO = 2
+EFFECT_FXAA = 4
+EFFECT_MOTION_BLUR = 8
+
+_EFFECT_DEFINES = (
+    (EFFECT_BLOOM, 'ENABLE_BLOOM'),
+    (EFFECT_SSAO, 'ENABLE_SSAO'),
+    (EFFECT_FXAA, 'ENABLE_FXAA'),
+    (EFFECT_MOTION_BLUR, 'ENABLE_MOTION_BLUR'),
 )
 
+# Scalar parameters arrive packed in one vec4 array (see PostProcessing._write_params)
+_POST_FRAG_TEMPLATE = """
+uniform sampler2D tex;
+uniform vec4 params[2];
+#define bloomIntensity params[0].x
+#define ssaoRadius params[0].y
+#define ssaoIntensity params[0].z
+#define blurStrength params[0].w
+#define texelSize params[1].xy
+#ifdef ENABLE_BLOOM
+uniform sampler2D glowTex;
+const float BLOOM_STEP = 0.005;
+const float BLOOM_WEIGHTS[5] = float[5](0.07, 0.24, 0.38, 0.24, 0.07);
+#endif
+#ifdef ENABLE_SSAO
+uniform sampler2D depthTex;
+uniform sampler2D noiseTex;
+const float NOISE_SIZE = 16.0;
+const vec2 KERNEL[8] = vec2[8](
+    vec2(-0.94201624, -0.39906216), vec2(0.94558609, -0.76890725),
+    vec2(-0.09418410, -0.92938870), vec2(0.34495938, 0.29387760),
+    vec2(-0.91588581, 0.45771432), vec2(-0.81544232, -0.87912464),
+    vec2(-0.38277543, 0.27676845), vec2(0.97484398, 0.75648379)
+);
+#endif
+#ifdef ENABLE_MOTION_BLUR
+uniform sampler2D prevTex;
+#endif
+void main() {
+    vec2 uv = gl_TexCoord[0].st;
+    vec4 color = texture2D(tex, uv);
+#ifdef ENABLE_FXAA
+    vec4 left = texture2D(tex, uv - vec2(texelSize.x, 0));
+    vec4 right = texture2D(tex, uv + vec2(texelSize.x, 0));
+    vec4 up = texture2D(tex, uv + vec2(0, texelSize.y));
+    vec4 down = texture2D(tex, uv - vec2(0, texelSize.y));
+    vec4 avg = (left + right + up + down + color) / 5.0;
+    float edge = length(color - avg);
+    color = mix(color, avg, clamp(edge * 2.0, 0.0, 1.0));
+#endif
+#ifdef ENABLE_MOTION_BLUR
+    color = mix(color, texture2D(prevTex, uv), blurStrength);
+#endif
+#ifdef ENABLE_SSAO
+    float depth = texture2D(depthTex, uv).r;
+    vec2 scale = 2.0 * texelSize * ssaoRadius;
+    float occlusion = 0.0;
+    // Per-pixel rotation from a tiled noise texture breaks up kernel banding
+    vec2 rot = texture2D(noiseTex, uv / (texelSize * NOISE_SIZE)).rg * 2.0 - 1.0;
+    for (int i = 0; i < 8; i++) {
+        vec2 k = KERNEL[i];
+        vec2 offset = vec2(k.x * rot.x - k.y * rot.y, k.x * rot.y + k.y * rot.x);
+        float sampleDepth = texture2D(depthTex, uv + offset * scale).r;
+        occlusion += (sampleDepth < depth - 0.01) ? 1.0 : 0.0;
+    }
+    occlusion /= 8.0;
+    color.rgb *= 1.0 - occlusion * ssaoIntensity;
+#endif
+#ifdef ENABLE_BLOOM
+    vec4 glow = vec4(0);
+    for (int i = 0; i < 5; i++) {
+        glow += texture2D(glowTex, uv + vec2(0.0, float(i - 2) * BLOOM_STEP)) * BLOOM_WEIGHTS[i];
+    }
+    color += glow * bloomIntensity;
+#endif
+    gl_FragColor = color;
+}
+"""
+
+_COLOR_GRADE_FRAG = """
+#version 120
+uniform sampler2D tex;
+uniform float contrast;
+uniform float saturation;
+uniform float brightness;
+uniform vec3 colorShift;
+void main() {
+    vec2 uv = gl_TexCoord[0].st;
+    vec4 color = texture2D(tex, uv);
+    // Contrast
+    color.rgb = (color.rgb - 0.5) * contrast + 0.5;
+    // Saturation
+    float gray = dot(color.rgb, vec3(0.299, 0.587, 0.114));
+    color.rgb = mix(vec3(gray), color.rgb, saturation);
+    // Brightness
+    color.rgb *= brightness;
+    // Color shift
+    color.rgb += colorShift;
+    gl_FragColor = clamp(color, 0.0, 1.0);
+}
+"""
+
+_VIGNETTE_FRAG = """
+#version 120
+uniform float intensity;
+void main() {
+    vec2 uv = gl_TexCoord[0].st;
+    vec2 center = uv - 0.5;
+    float dist = length(center);
+    float vignette = 1.0 - dist * intensity * 1.5;
+    vignette = smoothstep(0.0, 1.0, vignette);
+    gl_FragColor = vec4(0.0, 0.0, 0.0, (1.0 - vignette) * 0.85);
+}
+"""
+
+_SHADERS = {
+    'bright_pass': (_FULLSCREEN_VERT, _BRIGHT_PASS_FRAG),
+    'bloom_h': (_FULLSCREEN_VERT, _BLOOM_H_FRAG),
+    'color_grade': (_FULLSCREEN_VERT, _COLOR_GRADE_FRAG),
+    'vignette': (_FULLSCREEN_VERT, _VIGNETTE_FRAG),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _compiled_shader(name):
+    """Build the named post-processing shader once and reuse it afterwards."""
+    vert, frag = _SHADERS[name]
+    return Shader.make(Shader.SL_GLSL, vert, frag)
+
+
+@functools.lru_cache(maxsize=None)
+def _compiled_post_shader(effect_mask):
+    """Build the fused composite shader for one combination of effects."""
+    defines = ''.join(f'#define {name}\n' for bit, name in _EFFECT_DEFINES if effect_mask & bit)
+    frag = '#version 120\n' + defines + _POST_FRAG_TEMPLATE
+    return Shader.make(Shader.SL_GLSL, _FULLSCREEN_VERT, frag)
+
+
+SSAO_NOISE_SIZE = 16
+
+# Idle filter passes keyed by (width, height), reused instead of reallocating
+# GPU buffers when an effect is toggled back on
+_BUFFER_POOL = defaultdict(list)
+# Idle passes kept per size; any beyond this are freed
+MAX_POOLED_BUFFERS = 4
+
+
+def _make_noise_texture(size):
+    """Build a tiling texture of random unit rotations for the SSAO kernel.
+
+    Each texel stores (cos t, sin t) remapped to 0..1 in its red and green channels.
+    """
+    rng = random.Random(1337)
+    image = PNMImage(size, size, 3)
+    for x in range(size):
+        for y in range(size):
+            t = rng.uniform(0.0, 2.0 * math.pi)
+            image.setXel(x, y, math.cos(t) * 0.5 + 0.5, math.sin(t) * 0.5 + 0.5, 0.0)
+    texture = Texture('ssao_noise')
+    texture.load(image)
+    texture.setWrapU(Texture.WMRepeat)
+    texture.setWrapV(Texture.WMRepeat)
+    texture.setMagfilter(Texture.FTNearest)
+    texture.setMinfilter(Texture.FTNearest)
+    return texture
+
 
 class PostProcessing:
     """Post-processing effects manager for cinematic quality."""
@@ -24,131 +241,99 @@ class PostProcessing:
         self.is_setup = False
         self.bloom_task = None  # Initialize bloom task
         self.filters = None
+        self.bright_buffer = None
+        self.bright_tex = None
+        self.bright_quad = None
+        self.bloom_h_buffer = None
+        self.bloom_h_tex = None
+        self.bloom_h_quad = None
+        self._texel_size = (0.0, 0.0)
+        self.ssao_intensity = 1.5
+        self.motion_blur_strength = 0.5
+        # Shared with the composite shader; rewriting it needs no new shader input
+        self._post_params = PTA_LVecBase4f.empty_array(2)
+        self._effect_mask = 0
+        # Own event listener so ShowBase's window-event handler is left alone
+        self._events = DirectObject()
         
     def enable_bloom(self, intensity=1.2, threshold=1.0):
         """Enable bloom (HDR) effect for bright objects."""
         if not self.is_setup:
             self._setup_render_pipeline()
-        bloom_vert = """
-        #version 120
-        void main() {
-            gl_Position = ftransform();
-            gl_TexCoord[0] = gl_MultiTexCoord0;
-        }
-        """
-        bloom_frag = """
-        #version 120
-        uniform sampler2D tex;
-        uniform float intensity;
-        uniform float threshold;
-        void main() {
-            vec2 uv = gl_TexCoord[0].st;
-            vec4 color = texture2D(tex, uv);
-            float brightness = dot(color.rgb, vec3(0.2126, 0.7152, 0.0722));
-            if (brightness > threshold) {
-                vec4 glow = vec4(0);
-                for (int i = -1; i <= 1; i++) {
-                    for (int j = -1; j <= 1; j++) {
-                        vec2 offset = vec2(i, j) * 0.005;
-                        glow += texture2D(tex, uv + offset);
-                    }
-                }
-                glow /= 9.0;
-                gl_FragColor = color + glow * intensity;
-            } else {
-                gl_FragColor = color;
-            }
-        }
-        """
-        self.bloom_shader = Shader.make(Shader.SL_GLSL, bloom_vert, bloom_frag)
-        self.post_quad.set_shader(self.bloom_shader)
-        self.post_quad.set_shader_input('tex', self.scene_tex)
-        self.post_quad.set_shader_input('intensity', intensity)
-        self.post_quad.set_shader_input('threshold', threshold)
+        if self.bright_buffer is None:
+            width = max(1, self.base.win.get_x_size() // BLOOM_DOWNSAMPLE)
+            height = max(1, self.base.win.get_y_size() // BLOOM_DOWNSAMPLE)
+            self.bright_buffer, self.bright_tex, self.bright_quad = self._acquire_buffer(width, height)
+            self.bright_quad.set_shader(_compiled_shader('bright_pass'))
+            self.bright_quad.set_shader_input('tex', self.scene_tex)
+            self.bloom_h_buffer, self.bloom_h_tex, self.bloom_h_quad = self._acquire_buffer(width, height)
+            self.bloom_h_quad.set_shader(_compiled_shader('bloom_h'))
+            self.bloom_h_quad.set_shader_input('tex', self.bright_tex)
+        self.bright_quad.set_shader_input('threshold', threshold)
+        self.bright_buffer.set_active(True)
+        self.bloom_h_buffer.set_active(True)
+
+        self.post_quad.set_shader_input('glowTex', self.bloom_h_tex)
+        self.bloom_intensity = intensity
+        self._write_params()
         self.bloom_enabled = True
+        self._set_effect(EFFECT_BLOOM, True)
         
     def disable_bloom(self):
         """Disable bloom effect."""
-        if hasattr(self, 'bloom_shader'):
-            self.post_quad.set_shader(None)
-            self.bloom_enabled = False
+        self.bloom_enabled = False
+        self._release_bloom_passes()
+        if self.is_setup:
+            self._set_effect(EFFECT_BLOOM, False)
             
     def enable_ssao(self, radius=1.0, intensity=1.5):
         """Enable screen space ambient occlusion."""
         if not self.is_setup:
             self._setup_render_pipeline()
-        ssao_vert = """
-        #version 120
-        void main() {
-            gl_Position = ftransform();
-            gl_TexCoord[0] = gl_MultiTexCoord0;
-        }
-        """
-        ssao_frag = """
-        #version 120
-        uniform sampler2D tex;
-        uniform sampler2D depthTex;
-        uniform vec2 texelSize;
-        uniform float radius;
-        uniform float intensity;
-        void main() {
-            vec2 uv = gl_TexCoord[0].st;
-            vec4 color = texture2D(tex, uv);
-            float depth = texture2D(depthTex, uv).r;
-            float occlusion = 0.0;
-            for (int i = -2; i <= 2; i++) {
-                for (int j = -2; j <= 2; j++) {
-                    vec2 offset = vec2(i, j) * texelSize * radius;
-                    float sampleDepth = texture2D(depthTex, uv + offset).r;
-                    occlusion += (sampleDepth < depth - 0.01) ? 1.0 : 0.0;
-                }
-            }
-            occlusion /= 25.0;
-            float ao = 1.0 - occlusion * intensity;
-            gl_FragColor = color * vec4(vec3(ao), 1.0);
-        }
-        """
-        self.ssao_shader = Shader.make(Shader.SL_GLSL, ssao_vert, ssao_frag)
-        self.post_quad.set_shader(self.ssao_shader)
-        self.post_quad.set_shader_input('tex', self.scene_tex)
-        self.post_quad.set_shader_input('depthTex', self.depth_tex)
-        self.post_quad.set_shader_input('texelSize', (1.0 / self.base.win.get_x_size(), 1.0 / self.base.win.get_y_size()))
-        self.post_quad.set_shader_input('radius', radius)
-        self.post_quad.set_shader_input('intensity', intensity)
+        self.ssao_radius = radius
+        self.ssao_intensity = intensity
+        self._write_params()
         self.ssao_enabled = True
+        self._set_effect(EFFECT_SSAO, True)
+
+    def disable_ssao(self):
+        """Disable screen space ambient occlusion."""
+        self.ssao_enabled = False
+        if self.is_setup:
+            self._set_effect(EFFECT_SSAO, False)
         
     def enable_fxaa(self):
         """Enable fast approximate anti-aliasing."""
         if not self.is_setup:
             self._setup_render_pipeline()
-        fxaa_vert = """
-        #version 120
-        void main() {
-            gl_Position = ftransform();
-            gl_TexCoord[0] = gl_MultiTexCoord0;
-        }
-        """
-        fxaa_frag = """
-        #version 120
-        uniform sampler2D tex;
-        uniform vec2 texelSize;
-        void main() {
-            vec2 uv = gl_TexCoord[0].st;
-            vec4 color = texture2D(tex, uv);
-            vec4 left = texture2D(tex, uv - vec2(texelSize.x, 0));
-            vec4 right = texture2D(tex, uv + vec2(texelSize.x, 0));
-            vec4 up = texture2D(tex, uv + vec2(0, texelSize.y));
-            vec4 down = texture2D(tex, uv - vec2(0, texelSize.y));
-            vec4 avg = (left + right + up + down + color) / 5.0;
-            float edge = length(color - avg);
-            gl_FragColor = mix(color, avg, clamp(edge * 2.0, 0.0, 1.0));
-        }
-        """
-        self.fxaa_shader = Shader.make(Shader.SL_GLSL, fxaa_vert, fxaa_frag)
-        self.post_quad.set_shader(self.fxaa_shader)
-        self.post_quad.set_shader_input('tex', self.scene_tex)
-        self.post_quad.set_shader_input('texelSize', (1.0 / self.base.win.get_x_size(), 1.0 / self.base.win.get_y_size()))
         self.fxaa_enabled = True
+        self._set_effect(EFFECT_FXAA, True)
+
+    def disable_fxaa(self):
+        """Disable fast approximate anti-aliasing."""
+        self.fxaa_enabled = False
+        if self.is_setup:
+            self._set_effect(EFFECT_FXAA, False)
+
+    def _write_params(self):
+        """Pack the composite shader's scalar parameters into its shared array."""
+        self._post_params[0] = LVecBase4f(
+            self.bloom_intensity, self.ssao_radius, self.ssao_intensity, self.motion_blur_strength)
+        self._post_params[1] = LVecBase4f(self._texel_size[0], self._texel_size[1], 0.0, 0.0)
+
+    def _set_effect(self, effect, enabled):
+        """Toggle one effect bit and rebuild the composite shader if it changed."""
+        mask = self._effect_mask | effect if enabled else self._effect_mask & ~effect
+        if mask != self._effect_mask:
+            self._effect_mask = mask
+            self._rebuild_shader()
+
+    def _rebuild_shader(self):
+        """Put the fused shader for the current effect mask on the post quad."""
+        if self._effect_mask:
+            self.post_quad.set_shader(_compiled_post_shader(self._effect_mask))
+        else:
+            self.post_quad.clear_shader()
         
     def _setup_render_pipeline(self):
         """Set up enhanced rendering pipeline."""
@@ -160,22 +345,116 @@ class PostProcessing:
         fbprops.set_rgba_bits(8, 8, 8, 0)
         fbprops.set_depth_bits(24)
         self.scene_buffer = self.base.win.make_texture_buffer("scene", self.base.win.get_x_size(), self.base.win.get_y_size(), to_ram=False, fbp=fbprops)
+        # Offscreen passes render in creation order, all before the main window
+        self.scene_buffer.set_sort(-100)
+        self._next_pass_sort = -99
         self.scene_tex = Texture()
         self.scene_tex.set_format(Texture.F_rgba)
         self.depth_tex = Texture()
         self.depth_tex.set_format(Texture.F_depth_component)
         self.scene_buffer.add_render_texture(self.scene_tex, GraphicsOutput.RTMCopyTexture, GraphicsOutput.RTP_color)
         self.scene_buffer.add_render_texture(self.depth_tex, GraphicsOutput.RTMCopyTexture, GraphicsOutput.RTP_depth)
-        self.scene_camera = self.base.make_camera(self.scene_buffer)
-        self.scene_camera.reparent_to(self.base.render)
+        self.scene_buffer.set_clear_color(self.base.win.get_clear_color())
+        # Render the main camera into the offscreen buffer so it follows the
+        # player's transform and lens, and stop it drawing the scene to the
+        # window directly; the post quad composites scene_tex there instead.
+        self.scene_camera = self.base.make_camera(self.scene_buffer, useCamera=self.base.cam)
+        for region in self.base.win.get_display_regions():
+            if region.get_camera() == self.base.cam:
+                region.set_active(False)
         # Create quad for post-processing
         cm = CardMaker('post_quad')
         cm.set_frame_fullscreen_quad()
         self.post_quad = self.base.render2d.attach_new_node(cm.generate())
         self.post_quad.set_texture(self.scene_tex)
+        self._texel_size = (1.0 / self.base.win.get_x_size(), 1.0 / self.base.win.get_y_size())
+        self.post_quad.set_shader_input('tex', self.scene_tex)
+        self.post_quad.set_shader_input('depthTex', self.depth_tex)
+        self.post_quad.set_shader_input('prevTex', self.scene_tex)
+        self.post_quad.set_shader_input('params', self._post_params)
+        self._write_params()
+        self.post_quad.set_shader_input('noiseTex', _make_noise_texture(SSAO_NOISE_SIZE))
+        self._events.accept('window-event', self._on_resize)
         self.is_setup = True
         logging.info("Post-processing render pipeline setup completed")
+
+    def _on_resize(self, window):
+        """Refresh the cached texel size when the main window changes size."""
+        if window is not self.base.win:
+            return
+        texel_size = (1.0 / window.get_x_size(), 1.0 / window.get_y_size())
+        if texel_size != self._texel_size:
+            self._texel_size = texel_size
+            self._write_params()
+
+    def _make_filter_pass(self, name, width, height):
+        """Create an offscreen buffer that renders a fullscreen quad into a texture.
+
+        Returns the buffer, its color texture and the quad to put a shader on.
+        """
+        tex = Texture(name)
+        buffer = self.base.win.make_texture_buffer(name, width, height, tex)
+        buffer.set_sort(self._next_pass_sort)
+        self._next_pass_sort += 1
+        buffer.set_clear_color((0, 0, 0, 0))
+
+        cm = CardMaker(name)
+        cm.set_frame_fullscreen_quad()
+        quad = NodePath(cm.generate())
+        quad.set_depth_test(False)
+        quad.set_depth_write(False)
+
+        lens = OrthographicLens()
+        lens.set_film_size(2, 2)
+        lens.set_near_far(-1000, 1000)
+        cam_node = Camera(f'{name}_cam')
+        cam_node.set_lens(lens)
+        cam = quad.attach_new_node(cam_node)
+
+        region = buffer.make_display_region((0, 1, 0, 1))
+        region.disable_clears()
+        region.set_camera(cam)
+        return buffer, tex, quad
         
+    def _acquire_buffer(self, width, height):
+        """Take an idle filter pass of this size from the pool, or create one.
+
+        Returns the buffer, its color texture and the quad to put a shader on.
+        """
+        pool = _BUFFER_POOL[(width, height)]
+        if not pool:
+            return self._make_filter_pass(f'filter_{width}x{height}', width, height)
+        buffer, tex, quad = pool.pop()
+        # Keep passes rendering in the order they were acquired
+        buffer.set_sort(self._next_pass_sort)
+        self._next_pass_sort += 1
+        buffer.set_active(True)
+        return buffer, tex, quad
+
+    def _release_buffer(self, buffer, tex, quad):
+        """Deactivate a filter pass and return it to the pool for reuse."""
+        buffer.set_active(False)
+        quad.clear_shader()
+        pool = _BUFFER_POOL[(buffer.get_x_size(), buffer.get_y_size())]
+        if len(pool) < MAX_POOLED_BUFFERS:
+            pool.append((buffer, tex, quad))
+        else:
+            self.base.graphicsEngine.remove_window(buffer)
+
+    def _release_bloom_passes(self):
+        """Hand the bloom passes back to the pool if they are allocated."""
+        if self.bright_buffer is None:
+            return
+        self._release_buffer(self.bright_buffer, self.bright_tex, self.bright_quad)
+        self._release_buffer(self.bloom_h_buffer, self.bloom_h_tex, self.bloom_h_quad)
+        self.bright_buffer = self.bright_tex = self.bright_quad = None
+        self.bloom_h_buffer = self.bloom_h_tex = self.bloom_h_quad = None
+
+    def cleanup(self):
+        """Release pooled passes and stop listening for window events."""
+        self._release_bloom_passes()
+        self._events.ignore_all()
+
     def _update_bloom(self, task):
         """Update bloom effect — handled by shader, no per-frame work needed."""
         return task.cont
@@ -189,31 +468,10 @@ class PostProcessing:
         """Enable motion blur effect using frame accumulation shader."""
         if not self.is_setup:
             return
-        blur_vert = """
-        #version 120
-        void main() {
-            gl_Position = ftransform();
-            gl_TexCoord[0] = gl_MultiTexCoord0;
-        }
-        """
-        blur_frag = """
-        #version 120
-        uniform sampler2D tex;
-        uniform sampler2D prevTex;
-        uniform float strength;
-        void main() {
-            vec2 uv = gl_TexCoord[0].st;
-            vec4 current = texture2D(tex, uv);
-            vec4 previous = texture2D(prevTex, uv);
-            gl_FragColor = mix(current, previous, strength);
-        }
-        """
-        self.motion_blur_shader = Shader.make(Shader.SL_GLSL, blur_vert, blur_frag)
-        self.post_quad.set_shader(self.motion_blur_shader)
-        self.post_quad.set_shader_input('tex', self.scene_tex)
-        self.post_quad.set_shader_input('prevTex', self.scene_tex)
-        self.post_quad.set_shader_input('strength', strength)
+        self.motion_blur_strength = strength
+        self._write_params()
         self.motion_blur_enabled = True
+        self._set_effect(EFFECT_MOTION_BLUR, True)
 
 
 class CinematicEffects:
@@ -240,36 +498,6 @@ class CinematicEffects:
         }
         params = presets.get(preset, presets['neutral'])
         
-        vert = """
-        #version 120
-        void main() {
-            gl_Position = ftransform();
-            gl_TexCoord[0] = gl_MultiTexCoord0;
-        }
-        """
-        frag = """
-        #version 120
-        uniform sampler2D tex;
-        uniform float contrast;
-        uniform float saturation;
-        uniform float brightness;
-        uniform vec3 colorShift;
-        void main() {
-            vec2 uv = gl_TexCoord[0].st;
-            vec4 color = texture2D(tex, uv);
-            // Contrast
-            color.rgb = (color.rgb - 0.5) * contrast + 0.5;
-            // Saturation
-            float gray = dot(color.rgb, vec3(0.299, 0.587, 0.114));
-            color.rgb = mix(vec3(gray), color.rgb, saturation);
-            // Brightness
-            color.rgb *= brightness;
-            // Color shift
-            color.rgb += colorShift;
-            gl_FragColor = clamp(color, 0.0, 1.0);
-        }
-        """
-        from panda3d.core import CardMaker, TransparencyAttrib, Shader
         cm = CardMaker('color_grade')
         cm.setFrameFullscreenQuad()
         self._color_grade_quad = self.base.render2d.attachNewNode(cm.generate())
@@ -277,7 +505,7 @@ class CinematicEffects:
         self._color_grade_quad.setBin('fixed', 50)
         self._color_grade_quad.setDepthTest(False)
         self._color_grade_quad.setDepthWrite(False)
-        grade_shader = Shader.make(Shader.SL_GLSL, vert, frag)
+        grade_shader = _compiled_shader('color_grade')
         self._color_grade_quad.setShader(grade_shader)
         self._color_grade_quad.setShaderInput('tex', self.base.win.getTexture())
         self._color_grade_quad.setShaderInput('contrast', params[0])
@@ -290,26 +518,6 @@ class CinematicEffects:
         """Add darkened edges for cinematic look using a fullscreen shader quad."""
         if self._vignette_quad:
             return
-        vignette_vert = """
-        #version 120
-        void main() {
-            gl_Position = ftransform();
-            gl_TexCoord[0] = gl_MultiTexCoord0;
-        }
-        """
-        vignette_frag = """
-        #version 120
-        uniform float intensity;
-        void main() {
-            vec2 uv = gl_TexCoord[0].st;
-            vec2 center = uv - 0.5;
-            float dist = length(center);
-            float vignette = 1.0 - dist * intensity * 1.5;
-            vignette = smoothstep(0.0, 1.0, vignette);
-            gl_FragColor = vec4(0.0, 0.0, 0.0, (1.0 - vignette) * 0.85);
-        }
-        """
-        from panda3d.core import CardMaker, TransparencyAttrib, Shader
         cm = CardMaker('vignette')
         cm.setFrameFullscreenQuad()
         self._vignette_quad = self.base.render2d.attachNewNode(cm.generate())
@@ -317,7 +525,7 @@ class CinematicEffects:
         self._vignette_quad.setBin('fixed', 100)
         self._vignette_quad.setDepthTest(False)
         self._vignette_quad.setDepthWrite(False)
-        vignette_shader = Shader.make(Shader.SL_GLSL, vignette_vert, vignette_frag)
+        vignette_shader = _compiled_shader('vignette')
         self._vignette_quad.setShader(vignette_shader)
         self._vignette_quad.setShaderInput('intensity', intensity)
 
@@ -2,13 +2,17 @@
 Provides runtime adjustment of graphics quality and performance.
 """
 
+from collections import deque
+import types
+
 from config import ADVANCED_GRAPHICS
 from graphics.materials import MATERIAL_PRESETS
 import os
 
 
-PRESETS = {
-    'low': {
+# Read-only quality presets, built once at import
+_QUALITY_PRESETS = types.MappingProxyType({
+    'low': types.MappingProxyType({
         'texture_quality': 'low',
         'shadow_quality': 'low',
         'draw_distance': 500,
@@ -19,8 +23,8 @@ PRESETS = {
         'dynamic_weather': False,
         'foliage_wind': False,
         'fxaa': True
-    },
-    'medium': {
+    }),
+    'medium': types.MappingProxyType({
         'texture_quality': 'medium',
         'shadow_quality': 'medium',
         'draw_distance': 750,
@@ -31,8 +35,8 @@ PRESETS = {
         'dynamic_weather': True,
         'foliage_wind': True,
         'fxaa': True
-    },
-    'high': {
+    }),
+    'high': types.MappingProxyType({
         'texture_quality': 'high',
         'shadow_quality': 'medium',
         'draw_distance': 1000,
@@ -43,8 +47,8 @@ PRESETS = {
         'dynamic_weather': True,
         'foliage_wind': True,
         'fxaa': True
-    },
-    'ultra': {
+    }),
+    'ultra': types.MappingProxyType({
         'texture_quality': 'high',
         'shadow_quality': 'high',
         'draw_distance': 1500,
@@ -56,8 +60,11 @@ PRESETS = {
         'foliage_wind': True,
         'fxaa': True,
         'motion_blur_enabled': True
-    }
-}
+    })
+})
+
+# Backwards-compatible public name
+PRESETS = _QUALITY_PRESETS
 
 
 class GraphicsSettingsManager:
@@ -69,19 +76,20 @@ class GraphicsSettingsManager:
         
         # Current settings
         self.current_quality = 'high'
-        self.settings = ADVANCED_GRAPHICS.copy()
+        self.settings = types.SimpleNamespace(**ADVANCED_GRAPHICS)
+        # Snapshot of what apply_settings last pushed to the engine
+        self._applied_settings = {}
         
         # Performance monitoring
-        self.fps_samples = []
+        self.fps_samples = deque(maxlen=30)
         self.target_fps = 60
         self.suggesting_settings = False
         
     def set_quality_preset(self, quality_level):
         """Apply graphics preset (low, medium, high, ultra)."""
-        if quality_level in PRESETS:
-            for key, value in PRESETS[quality_level].items():
-                self.settings[key] = value
-                
+        preset = _QUALITY_PRESETS.get(quality_level)
+        if preset is not None:
+            vars(self.settings).update(preset)
             self.current_quality = quality_level
             self.apply_settings()
             print(f"Graphics quality set to: {quality_level}")
@@ -91,52 +99,71 @@ class GraphicsSettingsManager:
     def apply_settings(self):
         """Apply current graphics settings."""
         # Update Panda3D settings
-        from panda3d.core import Texture, AntialiasAttrib, GraphicsEngine
+        from panda3d.core import AntialiasAttrib
+
+        # Only touch the engine for settings that changed since the last apply
+        delta = {k: v for k, v in vars(self.settings).items() if self._applied_settings.get(k) != v}
         
         # Texture quality
         # Note: setDefaultAnisotropicDegree not available in this Panda3D version
         # Anisotropic filtering will need to be applied per-texture
-        if self.settings['texture_quality'] == 'low':
-            aniso_degree = 1
-        elif self.settings['texture_quality'] == 'medium':
-            aniso_degree = 4
-        else:
-            aniso_degree = 16
-        print(f"Anisotropic filtering degree: {aniso_degree} (applied to individual textures)")
+        if 'texture_quality' in delta:
+            if self.settings.texture_quality == 'low':
+                aniso_degree = 1
+            elif self.settings.texture_quality == 'medium':
+                aniso_degree = 4
+            else:
+                aniso_degree = 16
+            print(f"Anisotropic filtering degree: {aniso_degree} (applied to individual textures)")
         
         # Anti-aliasing
-        if self.settings['fxaa']:
-            self.render.setAntialias(AntialiasAttrib.MAuto)
-        else:
-            self.render.setAntialias(AntialiasAttrib.MNone)
+        if 'fxaa' in delta:
+            if self.settings.fxaa:
+                self.render.setAntialias(AntialiasAttrib.MAuto)
+            else:
+                self.render.setAntialias(AntialiasAttrib.MNone)
         
         # Draw distance
-        self.base.camLens.setFar(self.settings['draw_distance'])
+        if 'draw_distance' in delta:
+            self.base.camLens.setFar(self.settings.draw_distance)
         
+        # Settings for a system that does not exist yet are left out of the
+        # snapshot, so the next apply after it is created still applies them
+        applied = dict(vars(self.settings))
+
         # Apply other settings through their respective systems
         if hasattr(self.base, 'game'):
             game = self.base.game
             
             # Update materials
-            if self.settings['use_pbr']:
-                print("PBR Materials: Enabled")
-            else:
-                print("PBR Materials: Disabled")
-                
-            # Update post-processing
-            if hasattr(self, 'post_processing'):
-                if not self.settings['bloom_enabled']:
-                    self.post_processing.disable_bloom()
-                if self.settings['ssao_enabled']:
-                    self.post_processing.enable_ssao()
+            if 'use_pbr' in delta:
+                if self.settings.use_pbr:
+                    print("PBR Materials: Enabled")
+                else:
+                    print("PBR Materials: Disabled")
+        else:
+            applied.pop('use_pbr', None)
+
+        # Update post-processing
+        post_processing = getattr(self.base, 'post_processing', None)
+        if post_processing is not None:
+            if 'bloom_enabled' in delta and not self.settings.bloom_enabled:
+                post_processing.disable_bloom()
+            if 'ssao_enabled' in delta and self.settings.ssao_enabled:
+                post_processing.enable_ssao(self.settings.ssao_radius)
+        else:
+            applied.pop('bloom_enabled', None)
+            applied.pop('ssao_enabled', None)
+
+        self._applied_settings = applied
         
         print(f"Graphics settings applied - Quality: {self.current_quality}")
     
     def monitor_performance(self):
-        """Monitor frames per second and adjust settings if needed."""
-        # Frame rate monitoring disabled for now due to import issues
-        # Would monitor FPS and adjust settings based on performance
-        pass
+        """Record the current frame rate; called about once a second."""
+        from panda3d.core import ClockObject
+        self.fps_samples.append(ClockObject.getGlobalClock().getAverageFrameRate())
+        # Would adjust settings based on the sampled performance
     
     def get_performance_stats(self):
         """Get performance statistics."""
@@ -144,7 +171,7 @@ class GraphicsSettingsManager:
             'current_fps': 60,  # Placeholder
             'target_fps': self.target_fps,
             'quality_level': self.current_quality,
-            'settings': {k: v for k, v in self.settings.items() if k in ['texture_quality', 'shadow_quality', 'use_pbr', 'bloom_enabled']}
+            'settings': {k: v for k, v in vars(self.settings).items() if k in ['texture_quality', 'shadow_quality', 'use_pbr', 'bloom_enabled']}
         }
     
     def export_settings_report(self):
@@ -154,17 +181,17 @@ class GraphicsSettingsManager:
         report.append(f"Quality Level: {self.current_quality}")
         report.append(f"Target FPS: {self.target_fps}")
         report.append(f"Current FPS: 60")  # Placeholder
-        report.append(f"Draw Distance: {self.settings['draw_distance']} units\n")
+        report.append(f"Draw Distance: {self.settings.draw_distance} units\n")
         
         # System status
         features = [
-            ('PBR Materials', self.settings['use_pbr']),
-            ('Bloom Effect', self.settings['bloom_enabled']),
-            ('SSAO', self.settings['ssao_enabled']),
-            ('Volumetric Fog', self.settings['volumetric_fog']),
-            ('Dynamic Weather', self.settings['dynamic_weather']),
-            ('Foliage Wind', self.settings['foliage_wind']),
-            ('Motion Blur', self.settings['motion_blur_enabled'])
+            ('PBR Materials', self.settings.use_pbr),
+            ('Bloom Effect', self.settings.bloom_enabled),
+            ('SSAO', self.settings.ssao_enabled),
+            ('Volumetric Fog', self.settings.volumetric_fog),
+            ('Dynamic Weather', self.settings.dynamic_weather),
+            ('Foliage Wind', self.settings.foliage_wind),
+            ('Motion Blur', self.settings.motion_blur_enabled)
         ]
         
         report.append("Features:")
@@ -198,7 +225,8 @@ def create_optimized_graphics(base_app):
         manager.monitor_performance()
         return Task.again
     
-    base_app.taskMgr.add(monitor_perf, 'performanceMonitor', priority=5)
+    # Sample once a second rather than every frame
+    base_app.taskMgr.doMethodLater(1.0, monitor_perf, 'performanceMonitor')
     
     print("Optimized graphics system initialized")
     return manager
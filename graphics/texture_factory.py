@@ -1,163 +1,487 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+import functools
 import math
-from typing import Callable, Dict, Sequence
+import os
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
 
 import numpy as np
-from panda3d.core import PNMImage, Texture
-
+from panda3d.core import NodePath, SamplerState, Shader, ShaderAttrib, Texture
+
+from graphics._texture_kernels import (
+    flower_patch as _flower_patch_kernel,
+    leaf as _leaf_kernel,
+    track as _track_kernel,
+    water as _water_kernel,
+)
+
+
+__all__ = [
+    'prewarm_textures',
+    'create_vertical_gradient_texture',
+    'create_terrain_texture',
+    'create_leaf_texture',
+    'create_flower_patch_texture',
+    'create_bark_texture',
+    'create_grass_texture',
+    'create_crosshair_texture',
+    'create_sky_texture',
+    'get_ui_panel_texture',
+    'create_icon_texture',
+    'create_track_texture',
+    'create_water_texture',
+]
 
 _TEXTURE_CACHE: Dict[str, Texture] = {}
+# Builds in flight, so a second request for the same key waits instead of rebuilding
+_PENDING_BUILDS: Dict[str, Future] = {}
+_CACHE_LOCK = threading.Lock()
+_PREWARM_EXECUTOR: Optional[ThreadPoolExecutor] = None
+# Per-thread float32 RGBA work buffers reused across builds (see _scratch_rgba)
+_SCRATCH = threading.local()
+# Leaf disc color and radius per size, shared by the leaf and grass sprites
+_LEAF_DISC_CACHE: Dict[int, tuple] = {}
+
+# Default-size sprites whose packed pixels are kept on disk between runs.
+# Bump the version whenever one of their builders changes its output.
+_DISK_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "texture_cache")
+_DISK_CACHE_VERSION = 2
+_DISK_CACHE_KEYS = frozenset({"crosshair-192", "leaf-128", "grass-128", "bark-64", "track-64"})
 
 
 def _cache_texture(key: str, builder: Callable[[], Texture]) -> Texture:
-    texture = _TEXTURE_CACHE.get(key)
-    if texture is None:
+    with _CACHE_LOCK:
+        texture = _TEXTURE_CACHE.get(key)
+        if texture is not None:
+            return texture
+        pending = _PENDING_BUILDS.get(key)
+        if pending is None:
+            pending = _PENDING_BUILDS[key] = Future()
+            owner = True
+        else:
+            owner = False
+    if not owner:
+        return pending.result()
+
+    try:
         texture = builder()
+    except BaseException as exc:
+        with _CACHE_LOCK:
+            del _PENDING_BUILDS[key]
+        pending.set_exception(exc)
+        raise
+    with _CACHE_LOCK:
         _TEXTURE_CACHE[key] = texture
+        del _PENDING_BUILDS[key]
+    pending.set_result(texture)
     return texture
 
 
+def prewarm_textures(factories: Iterable[Callable[[], Texture]]) -> List[Future]:
+    """Start building textures on background threads, e.g. behind a splash screen.
+
+    Each factory is a zero-argument call such as
+    ``functools.partial(create_leaf_texture, 128)``. Later calls for the same
+    texture return the cached result, or wait for the build still in flight.
+    Panda3D only uploads a texture's RAM image when it is first rendered, so
+    CPU builds are safe off the main thread. Builders that would render on
+    the GPU, such as create_sky_texture with an ``app``, fall back to their
+    CPU path there, since the GSG can only be driven from the main thread.
+    """
+    global _PREWARM_EXECUTOR
+    with _CACHE_LOCK:
+        if _PREWARM_EXECUTOR is None:
+            _PREWARM_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="texture-prewarm")
+        executor = _PREWARM_EXECUTOR
+    return [executor.submit(factory) for factory in factories]
+
+
 def _lerp(a: Sequence[float], b: Sequence[float], t: float) -> tuple:
-    return tuple(a[i] * (1.0 - t) + b[i] * t for i in range(3))
+    return (
+        a[0] * (1.0 - t) + b[0] * t,
+        a[1] * (1.0 - t) + b[1] * t,
+        a[2] * (1.0 - t) + b[2] * t,
+    )
+
+
+def _lerp_np(a, b, t):
+    """Array counterpart of _lerp: broadcasts colors (..., 3) against weights."""
+    return a + (b - a) * t
+
 
+def _build_hash_table(size: int) -> np.ndarray:
+    """Sine hash of every (x, y) in a size x size tile, indexed [y, x].
 
-def _hash_noise(x: int, y: int) -> float:
-    value = math.fmod(math.sin(x * 12.9898 + y * 78.233) * 43758.5453, 1.0)
+    Computed in float64 because the sine arguments run into the tens of
+    thousands, where float32 loses the fractional digits the hash depends on.
+    """
+    ys = np.arange(size) * 78.233
+    xs = np.arange(size) * 12.9898
+    value = np.fmod(np.sin(np.add.outer(ys, xs)) * 43758.5453, 1.0)
     # Normalize to [0, 1] since fmod can return negative values
-    return (value + 1.0) % 1.0
-
-
-def _perlin_like_noise(x: float, y: float, frequency: float = 1.0) -> float:
-    """Generate smoother Perlin-like noise for natural variation."""
-    x *= frequency
-    y *= frequency
-    x0 = int(math.floor(x))
-    x1 = x0 + 1
-    y0 = int(math.floor(y))
-    y1 = y0 + 1
-    
-    # Interpolation weights
-    sx = x - x0
-    sy = y - y0
-    
-    # Smoothstep for better interpolation
+    return ((value + 1.0) % 1.0).astype(np.float32)
+
+
+# Built once at import (4 MiB) so every builder's noise is a table lookup
+_HASH_TABLE_SIZE = 1024
+_HASH_TABLE = _build_hash_table(_HASH_TABLE_SIZE)
+
+
+def _hash_noise_grid(xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+    """Look up hash noise for broadcastable whole-number coordinate arrays.
+
+    Coordinates may be integer or float arrays holding whole numbers, and
+    wrap every _HASH_TABLE_SIZE, so the noise tiles beyond that.
+    """
+    mask = _HASH_TABLE_SIZE - 1
+    xs = xs.astype(np.intp, copy=False)
+    ys = ys.astype(np.intp, copy=False)
+    return _HASH_TABLE[np.bitwise_and(ys, mask), np.bitwise_and(xs, mask)]
+
+
+def _perlin_like_noise_grid(xs: np.ndarray, ys: np.ndarray, frequency: float = 1.0) -> np.ndarray:
+    """Generate smoother Perlin-like noise for natural variation.
+
+    Works on broadcastable coordinate arrays, hashing the four surrounding
+    lattice corners and blending them with a smoothstep bilinear weight.
+    """
+    xs = xs * frequency
+    ys = ys * frequency
+    x0 = np.floor(xs)
+    y0 = np.floor(ys)
+
+    sx = xs - x0
+    sy = ys - y0
     sx = sx * sx * (3.0 - 2.0 * sx)
     sy = sy * sy * (3.0 - 2.0 * sy)
-    
-    # Hash corners
-    n0 = _hash_noise(x0, y0)
-    n1 = _hash_noise(x1, y0)
-    n2 = _hash_noise(x0, y1)
-    n3 = _hash_noise(x1, y1)
-    
-    # Bilinear interpolation
+
+    x0 = x0.astype(np.intp)
+    y0 = y0.astype(np.intp)
+    n0 = _hash_noise_grid(x0, y0)
+    n1 = _hash_noise_grid(x0 + 1, y0)
+    n2 = _hash_noise_grid(x0, y0 + 1)
+    n3 = _hash_noise_grid(x0 + 1, y0 + 1)
+
     nx0 = n0 * (1 - sx) + n1 * sx
     nx1 = n2 * (1 - sx) + n3 * sx
-    
     return nx0 * (1 - sy) + nx1 * sy
 
 
+def _cloud_noise_grid(size: int) -> np.ndarray:
+    """Four octaves of Perlin-like noise for the sky clouds, indexed [y, x]."""
+    xs, ys = _pixel_grid(size)
+    noise1 = _perlin_like_noise_grid(xs / (size / 4), ys / (size / 6), 0.35)
+    noise2 = _perlin_like_noise_grid(xs / (size / 9), ys / (size / 9), 0.9) * 0.9
+    noise3 = _perlin_like_noise_grid(xs / (size / 25), ys / (size / 25), 1.8) * 0.55
+    detail = _perlin_like_noise_grid(xs / (size / 80), ys / (size / 80), 3.7) * 0.35
+    return (noise1 + noise2 + noise3 + detail) / 2.0
+
+
+def _scratch_rgba(height: int, width: int) -> np.ndarray:
+    """Return this thread's reusable float32 RGBA buffer of the given size.
+
+    The contents are left over from the previous build, so builders must
+    write every pixel. The buffer is only valid until the next build on the
+    same thread; _to_bgra copies the result out before then.
+    """
+    buffers = getattr(_SCRATCH, "buffers", None)
+    if buffers is None:
+        buffers = _SCRATCH.buffers = {}
+    rgba = buffers.get((height, width))
+    if rgba is None:
+        rgba = buffers[(height, width)] = np.empty((height, width, 4), dtype=np.float32)
+    return rgba
+
+
+def _to_bgra(rgba: np.ndarray) -> np.ndarray:
+    """Pack a float RGBA image into the uint8 layout Panda3D keeps in RAM.
+
+    ``rgba`` has shape (height, width, 4), rows top to bottom, with channel
+    values in 0..1; it is used as working space and overwritten. The result
+    is bottom row first, in BGRA channel order.
+    """
+    np.clip(rgba, 0.0, 1.0, out=rgba)
+    rgba *= 255.0
+    rgba += 0.5
+    pixels = rgba.astype(np.uint8)
+    return np.ascontiguousarray(pixels[::-1, :, (2, 1, 0, 3)])
+
+
+def _texture_from_bgra(name: str, bgra: np.ndarray, wrap: int, minfilter: int) -> Texture:
+    """Upload packed pixels from _to_bgra straight into an 8-bit texture's RAM image.
+
+    The texture uses ``wrap`` on both axes and linear magnification; mipmapped
+    minification filters get their mip levels generated from the uint8 image.
+    """
+    height, width = bgra.shape[:2]
+    texture = Texture(name)
+    texture.setup2dTexture(width, height, Texture.TUnsignedByte, Texture.FRgba8)
+    texture.setRamImage(bgra.tobytes())
+    if SamplerState.isMipmap(minfilter):
+        # Build the uint8 mip chain with the texture so it uploads in one go
+        texture.generateRamMipmapImages()
+    texture.setWrapU(wrap)
+    texture.setWrapV(wrap)
+    texture.setMagfilter(Texture.FTLinear)
+    texture.setMinfilter(minfilter)
+    return texture
+
+
+def _texture_from_rgba(name: str, rgba: np.ndarray, wrap: int, minfilter: int) -> Texture:
+    """Upload a float RGBA image (see _to_bgra) as an 8-bit texture."""
+    return _texture_from_bgra(name, _to_bgra(rgba), wrap, minfilter)
+
+
+def _baked_texture(key: str, name: str, build_rgba: Callable[[], np.ndarray],
+                   wrap: int, minfilter: int) -> Texture:
+    """Like _texture_from_rgba, but reuse packed pixels saved by an earlier run.
+
+    Only keys in _DISK_CACHE_KEYS touch the disk; a missing or unreadable
+    file just means the pixels are built and saved again.
+    """
+    if key not in _DISK_CACHE_KEYS:
+        return _texture_from_rgba(name, build_rgba(), wrap, minfilter)
+
+    path = os.path.join(_DISK_CACHE_DIR, f"{key}-v{_DISK_CACHE_VERSION}.npy")
+    try:
+        bgra = np.load(path, mmap_mode="r")
+    except (OSError, ValueError):
+        bgra = _to_bgra(build_rgba())
+        try:
+            os.makedirs(_DISK_CACHE_DIR, exist_ok=True)
+            np.save(path, bgra)
+        except OSError:
+            pass
+    return _texture_from_bgra(name, bgra, wrap, minfilter)
+
+
+def _pixel_grid(size: int):
+    """Float32 x (columns) and y (rows) pixel coordinates that broadcast to a size x size image.
+
+    Builders work in float32 throughout, since the results end up as 8-bit
+    channels; mixing in float64 arrays would silently promote every
+    expression back to float64.
+    """
+    coords = np.arange(size, dtype=np.float32)
+    return coords[None, :], coords[:, None]
+
+
+def _bark_pixels(size: int) -> np.ndarray:
+    """RGBA image of striped, grained tree bark."""
+    xs, ys = _pixel_grid(size)
+    stripe = 0.5 + 0.5 * np.sin(xs * 0.35)
+    grain = (np.sin((xs + ys) * 0.18) + 1.0) * 0.5
+    t = np.clip(stripe * 0.6 + grain * 0.4, 0.0, 1.0)
+    base = np.array((0.24, 0.17, 0.1), dtype=np.float32)
+    highlight = np.array((0.34, 0.25, 0.16), dtype=np.float32)
+    rgba = _scratch_rgba(size, size)
+    rgba[..., :3] = _lerp_np(base, highlight, t[..., None])
+    rgba[..., 3] = 1.0
+    return rgba
+
+
+def _crosshair_pixels(size: int) -> np.ndarray:
+    """RGBA image of the ring-and-lines crosshair."""
+    center = size / 2.0
+    ring_radius = size * 0.32
+    ring_thickness = size * 0.02
+    gap = size * 0.06
+    line_thickness = max(1.0, size * 0.01)
+
+    xs, ys = _pixel_grid(size)
+    dx = np.abs(xs - center)
+    dy = np.abs(ys - center)
+    dist = np.hypot(dx, dy)
+    ring = np.abs(dist - ring_radius) <= ring_thickness
+    vertical_line = (dx <= line_thickness) & (gap < dy) & (dy <= ring_radius)
+    horizontal_line = (dy <= line_thickness) & (gap < dx) & (dx <= ring_radius)
+    dot = dist <= line_thickness * 1.5
+    mask = ring | vertical_line | horizontal_line | dot
+
+    rgba = _scratch_rgba(size, size)
+    rgba.fill(0.0)
+    rgba[mask] = (0.95, 0.95, 0.95, 1.0)
+    return rgba
+
+
+def _leaf_disc(size: int):
+    """Color and normalized radius of the round leaf sprite, shared by leaf and grass.
+
+    Returns (rgb, t) where ``t`` is distance from the center over the disc
+    radius, so pixels with t > 1 lie outside the disc (their rgb is black).
+    Results are cached per size and must not be modified.
+    """
+    disc = _LEAF_DISC_CACHE.get(size)
+    if disc is not None:
+        return disc
+    rgb = np.empty((size, size, 3), dtype=np.float32)
+    t = np.empty((size, size), dtype=np.float32)
+    if _leaf_kernel is not None:
+        _leaf_kernel(rgb, t)
+    else:
+        xs, ys = _pixel_grid(size)
+        center = size / 2.0
+        radius = size * 0.45
+        t[...] = np.hypot(xs - center, ys - center) / radius
+        base = np.array((0.08, 0.32, 0.05), dtype=np.float32)
+        edge = np.array((0.12, 0.38, 0.08), dtype=np.float32)
+        noise = (_hash_noise_grid(xs, ys) - 0.5) * 0.06
+        rgb[...] = _lerp_np(base, edge, t[..., None]) + noise[..., None]
+        rgb[t > 1.0] = 0.0
+    disc = _LEAF_DISC_CACHE[size] = (rgb, t)
+    return disc
+
+
+def _leaf_pixels(size: int) -> np.ndarray:
+    """RGBA image of the round leaf sprite."""
+    rgb, t = _leaf_disc(size)
+    rgba = _scratch_rgba(size, size)
+    rgba[..., :3] = rgb
+    rgba[..., 3] = t <= 1.0
+    return rgba
+
+
+def _grass_pixels(size: int) -> np.ndarray:
+    """RGBA image of the grass sprite: the leaf disc with alpha fading towards the rim."""
+    rgb, t = _leaf_disc(size)
+    rgba = _scratch_rgba(size, size)
+    rgba[..., :3] = rgb
+    rgba[..., 3] = np.where(t <= 1.0, 0.7 + (1.0 - t) * 0.3, 0.0)
+    return rgba
+
+
+_PETAL_PALETTE = np.array([
+    (0.94, 0.82, 0.28),
+    (0.93, 0.68, 0.74),
+    (0.88, 0.9, 0.95),
+    (0.78, 0.86, 0.4),
+], dtype=np.float32)
+
+
+def _flower_patch_pixels(size: int) -> np.ndarray:
+    """RGBA image of a grassy disc scattered with petals."""
+    rgba = _scratch_rgba(size, size)
+    if _flower_patch_kernel is not None:
+        _flower_patch_kernel(rgba, _PETAL_PALETTE)
+        return rgba
+    xs, ys = _pixel_grid(size)
+    center = size / 2.0
+    radius = size * 0.48
+    dist = np.hypot(xs - center, ys - center)
+    falloff = 1.0 - dist / radius
+    base = 0.18 + falloff * 0.22
+    noise = (_hash_noise_grid(xs, ys) - 0.5) * 0.05
+    rgba[..., 0] = base * 0.6 + noise
+    rgba[..., 1] = 0.3 + base * 0.8 + noise * 1.2
+    rgba[..., 2] = base * 0.45 + noise * 0.6
+    rgba[..., 3] = 0.75 + falloff * 0.2
+    rgba[dist > radius] = 0.0
+
+    highlight = _hash_noise_grid(xs + size, ys - size)
+    petals = (dist <= radius * 0.96) & (highlight > 0.87)
+    petal_index = (highlight * len(_PETAL_PALETTE)).astype(np.intp) % len(_PETAL_PALETTE)
+    rgba[petals, :3] = _PETAL_PALETTE[petal_index[petals]]
+    rgba[petals, 3] = 0.98
+    return rgba
+
+
+def _water_pixels(size: int) -> np.ndarray:
+    """RGBA image of a circular water surface with concentric ripples."""
+    rgba = _scratch_rgba(size, size)
+    if _water_kernel is not None:
+        _water_kernel(rgba)
+        return rgba
+    xs, ys = _pixel_grid(size)
+    center = size / 2.0
+    r = np.hypot((xs - center) / center, (ys - center) / center)
+    shallow = np.array((0.08, 0.21, 0.32), dtype=np.float32)
+    deep = np.array((0.12, 0.35, 0.48), dtype=np.float32)
+    ripple = np.sin(r * 14.0) * 0.03 + (_hash_noise_grid(xs, ys) - 0.5) * 0.02
+    rgba[..., :3] = _lerp_np(shallow, deep, r[..., None]) + ripple[..., None]
+    rgba[..., 3] = np.maximum(0.25, 1.0 - r * 0.7)
+    rgba[r > 1.0] = 0.0
+    return rgba
+
+
+def _track_pixels(size: int) -> np.ndarray:
+    """RGBA image of a soft-edged hoofprint depression."""
+    rgba = _scratch_rgba(size, size)
+    if _track_kernel is not None:
+        _track_kernel(rgba)
+        return rgba
+    xs, ys = _pixel_grid(size)
+    center = size / 2.0
+    dist = np.hypot((xs - center) / center, (ys - center) / center)
+    depth = (1.0 - dist) ** 2
+    color = 0.25 + depth * 0.45
+    rgba[..., 0] = color
+    rgba[..., 1] = color * 0.75
+    rgba[..., 2] = 0.28
+    rgba[..., 3] = np.minimum(1.0, depth * 2.5)
+    rgba[dist > 1.0] = 0.0
+    return rgba
+
+
 def create_vertical_gradient_texture(size: int, top_color: Sequence[float], bottom_color: Sequence[float]) -> Texture:
     cache_key = f"vertical-gradient-{size}-{top_color}-{bottom_color}"
 
     def builder() -> Texture:
-        image = PNMImage(size, size, 4)
-        for y in range(size):
-            t = y / float(size - 1)
-            r, g, b = _lerp(top_color, bottom_color, t)
-            for x in range(size):
-                image.setXel(x, y, r, g, b)
-                image.setAlpha(x, y, 1.0)
-        texture = Texture("vertical-gradient")
-        texture.load(image)
-        texture.setWrapU(Texture.WMClamp)
-        texture.setWrapV(Texture.WMClamp)
-        texture.setMagfilter(Texture.FTLinear)
-        texture.setMinfilter(Texture.FTLinear)
-        return texture
+        # One color per row, broadcast across every column
+        t = np.linspace(0.0, 1.0, size, dtype=np.float32)[:, None]
+        top = np.array(top_color[:3], dtype=np.float32)
+        bottom = np.array(bottom_color[:3], dtype=np.float32)
+        rgba = _scratch_rgba(size, size)
+        rgba[..., :3] = _lerp_np(top, bottom, t)[:, None, :]
+        rgba[..., 3] = 1.0
+        return _texture_from_rgba("vertical-gradient", rgba, Texture.WMClamp, Texture.FTLinear)
 
     return _cache_texture(cache_key, builder)
 
 
+# Normalized heights where the terrain color bands change, and the color of
+# each band: low greens, mid browns, high grays
+_TERRAIN_BAND_LIMITS = np.array((0.3, 0.7), dtype=np.float32)
+_TERRAIN_BAND_COLORS = np.array([(0.2, 0.4, 0.1), (0.4, 0.3, 0.2), (0.5, 0.5, 0.5)], dtype=np.float32)
+
+
 def create_terrain_texture(height_map: np.ndarray) -> Texture:
     if height_map is None:
         raise ValueError("height_map must be provided")
 
     h, w = height_map.shape
 
-    image = PNMImage(h, w, 4)
-
     # Normalize height map
+    height_map = height_map.astype(np.float32, copy=False)
     min_h = np.min(height_map)
     max_h = np.max(height_map)
     if max_h == min_h:
-        normalized_height = np.full_like(height_map, 0.5)
+        normalized_height = np.full(height_map.shape, 0.5, dtype=np.float32)
     else:
         normalized_height = (height_map - min_h) / (max_h - min_h)
 
-    for x in range(h):
-        for y in range(w):
-            height = normalized_height[x, y]
-
-            # Define terrain colors based on height
-            if height < 0.3:
-                # Low areas: greens
-                base_color = (0.2, 0.4, 0.1)
-            elif height < 0.7:
-                # Mid areas: browns
-                base_color = (0.4, 0.3, 0.2)
-            else:
-                # High areas: grays
-                base_color = (0.5, 0.5, 0.5)
+    # Terrain colors by height band; a height equal to a limit belongs to the band above it
+    band = np.searchsorted(_TERRAIN_BAND_LIMITS, normalized_height, side="right")
 
-            # Add Perlin noise for variation
-            noise_val = _perlin_like_noise(x / 32.0, y / 32.0, 1.0) * 0.1
+    # Add Perlin noise for variation
+    xs = np.arange(h, dtype=np.float32)[:, None]
+    ys = np.arange(w, dtype=np.float32)[None, :]
+    noise_val = _perlin_like_noise_grid(xs / 32.0, ys / 32.0, 1.0) * 0.1
 
-            # Apply the noise to the base color
-            color = tuple(max(0.0, min(1.0, c + noise_val)) for c in base_color)
+    rgba = _scratch_rgba(h, w)
+    rgba[..., :3] = _TERRAIN_BAND_COLORS[band] + noise_val[..., None]
+    rgba[..., 3] = 1.0
 
-            image.setXel(x, y, *color)
-            image.setAlpha(x, y, 1.0)
-
-    texture = Texture("terrain-texture")
-    texture.load(image)
-    texture.setWrapU(Texture.WMRepeat)
-    texture.setWrapV(Texture.WMRepeat)
-    texture.setMagfilter(Texture.FTLinear)
-    texture.setMinfilter(Texture.FTLinearMipmapLinear)
-    return texture
+    # Height map rows run along the texture's x axis
+    return _texture_from_rgba(
+        "terrain-texture", rgba.transpose(1, 0, 2), Texture.WMRepeat, Texture.FTLinearMipmapLinear)
 
 
 def create_leaf_texture(size: int = 128) -> Texture:
     cache_key = f"leaf-{size}"
 
     def builder() -> Texture:
-        image = PNMImage(size, size, 4)
-        center = size / 2.0
-        radius = size * 0.45
-        for x in range(size):
-            for y in range(size):
-                dx = x - center
-                dy = y - center
-                dist = math.sqrt(dx * dx + dy * dy)
-                if dist > radius:
-                    image.setAlpha(x, y, 0.0)
-                    continue
-                t = dist / radius
-                base = (0.08, 0.32, 0.05)
-                edge = (0.12, 0.38, 0.08)
-                color = _lerp(base, edge, t)
-                noise = _hash_noise(x, y) - 0.5
-                color = tuple(max(0.0, min(1.0, c + noise * 0.06)) for c in color)
-                image.setXel(x, y, *color)
-                image.setAlpha(x, y, 1.0)
-
-        texture = Texture("leaf-texture")
-        texture.load(image)
-        texture.setWrapU(Texture.WMMirror)
-        texture.setWrapV(Texture.WMMirror)
-        texture.setMagfilter(Texture.FTLinear)
-        texture.setMinfilter(Texture.FTLinearMipmapLinear)
-        return texture
+        return _baked_texture(cache_key, "leaf-texture", lambda: _leaf_pixels(size),
+                              Texture.WMMirror, Texture.FTLinearMipmapLinear)
 
     return _cache_texture(cache_key, builder)
 
@@ -166,56 +490,8 @@ def create_flower_patch_texture(size: int = 128) -> Texture:
     cache_key = f"flower-patch-{size}"
 
     def builder() -> Texture:
-        image = PNMImage(size, size, 4)
-        center = size / 2.0
-        radius = size * 0.48
-
-        petal_palette = [
-            (0.94, 0.82, 0.28),
-            (0.93, 0.68, 0.74),
-            (0.88, 0.9, 0.95),
-            (0.78, 0.86, 0.4),
-        ]
-
-        for x in range(size):
-            for y in range(size):
-                dx = x - center
-                dy = y - center
-                dist = math.sqrt(dx * dx + dy * dy)
-                if dist > radius:
-                    image.setAlpha(x, y, 0.0)
-                    continue
-
-                falloff = 1.0 - (dist / radius)
-                base = 0.18 + falloff * 0.22
-                noise = (_hash_noise(x, y) - 0.5) * 0.05
-                r = max(0.0, min(1.0, base * 0.6 + noise))
-                g = max(0.0, min(1.0, 0.3 + base * 0.8 + noise * 1.2))
-                b = max(0.0, min(1.0, base * 0.45 + noise * 0.6))
-                image.setXel(x, y, r, g, b)
-                alpha = 0.75 + falloff * 0.2
-                image.setAlpha(x, y, max(0.0, min(1.0, alpha)))
-
-        for x in range(size):
-            for y in range(size):
-                dx = x - center
-                dy = y - center
-                dist = math.sqrt(dx * dx + dy * dy)
-                if dist > radius * 0.96:
-                    continue
-                highlight = _hash_noise(x + size, y - size)
-                if highlight > 0.87:
-                    petals = petal_palette[int(highlight * len(petal_palette)) % len(petal_palette)]
-                    image.setXel(x, y, *petals)
-                    image.setAlpha(x, y, 0.98)
-
-        texture = Texture("flower-patch")
-        texture.load(image)
-        texture.setWrapU(Texture.WMClamp)
-        texture.setWrapV(Texture.WMClamp)
-        texture.setMagfilter(Texture.FTLinear)
-        texture.setMinfilter(Texture.FTLinearMipmapLinear)
-        return texture
+        rgba = _flower_patch_pixels(size)
+        return _texture_from_rgba("flower-patch", rgba, Texture.WMClamp, Texture.FTLinearMipmapLinear)
 
     return _cache_texture(cache_key, builder)
 
@@ -224,25 +500,8 @@ def create_bark_texture(size: int = 64) -> Texture:
     cache_key = f"bark-{size}"
 
     def builder() -> Texture:
-        image = PNMImage(size, size, 4)
-        for x in range(size):
-            stripe = 0.5 + 0.5 * math.sin(x * 0.35)
-            for y in range(size):
-                grain = (math.sin((y + x) * 0.18) + 1.0) * 0.5
-                base = (0.24, 0.17, 0.1)
-                highlight = (0.34, 0.25, 0.16)
-                t = min(1.0, max(0.0, stripe * 0.6 + grain * 0.4))
-                color = _lerp(base, highlight, t)
-                image.setXel(x, y, *color)
-                image.setAlpha(x, y, 1.0)
-
-        texture = Texture("bark-texture")
-        texture.load(image)
-        texture.setWrapU(Texture.WMRepeat)
-        texture.setWrapV(Texture.WMRepeat)
-        texture.setMagfilter(Texture.FTLinear)
-        texture.setMinfilter(Texture.FTLinearMipmapLinear)
-        return texture
+        return _baked_texture(cache_key, "bark-texture", lambda: _bark_pixels(size),
+                              Texture.WMRepeat, Texture.FTLinearMipmapLinear)
 
     return _cache_texture(cache_key, builder)
 
@@ -251,34 +510,8 @@ def create_grass_texture(size: int = 128) -> Texture:
     cache_key = f"grass-{size}"
 
     def builder() -> Texture:
-        image = PNMImage(size, size, 4)
-        center = size / 2.0
-        radius = size * 0.45
-        for x in range(size):
-            for y in range(size):
-                dx = x - center
-                dy = y - center
-                dist = math.sqrt(dx * dx + dy * dy)
-                if dist > radius:
-                    image.setAlpha(x, y, 0.0)
-                    continue
-                t = dist / radius
-                base = (0.08, 0.32, 0.05)
-                edge = (0.12, 0.38, 0.08)
-                color = _lerp(base, edge, t)
-                noise = _hash_noise(x, y) - 0.5
-                color = tuple(max(0.0, min(1.0, c + noise * 0.06)) for c in color)
-                image.setXel(x, y, *color)
-                alpha = 0.7 + (1.0 - t) * 0.3  # Fade edges
-                image.setAlpha(x, y, alpha)
-
-        texture = Texture("grass-texture")
-        texture.load(image)
-        texture.setWrapU(Texture.WMMirror)
-        texture.setWrapV(Texture.WMMirror)
-        texture.setMagfilter(Texture.FTLinear)
-        texture.setMinfilter(Texture.FTLinearMipmapLinear)
-        return texture
+        return _baked_texture(cache_key, "grass-texture", lambda: _grass_pixels(size),
+                              Texture.WMMirror, Texture.FTLinearMipmapLinear)
 
     return _cache_texture(cache_key, builder)
 
@@ -287,60 +520,143 @@ def create_crosshair_texture(size: int = 192) -> Texture:
     cache_key = f"crosshair-{size}"
 
     def builder() -> Texture:
-        image = PNMImage(size, size, 4)
-        center = size / 2.0
-        ring_radius = size * 0.32
-        ring_thickness = size * 0.02
-        gap = size * 0.06
-        line_thickness = max(1.0, size * 0.01)
-
-        for x in range(size):
-            for y in range(size):
-                dx = x - center
-                dy = y - center
-                dist = math.hypot(dx, dy)
-                alpha = 0.0
-                if abs(dist - ring_radius) <= ring_thickness:
-                    alpha = 1.0
-                elif abs(dx) <= line_thickness and gap < abs(dy) <= ring_radius:
-                    alpha = 1.0
-                elif abs(dy) <= line_thickness and gap < abs(dx) <= ring_radius:
-                    alpha = 1.0
-                elif dist <= line_thickness * 1.5:
-                    alpha = 1.0
-
-                if alpha > 0.0:
-                    image.setXel(x, y, 0.95, 0.95, 0.95)
-                    image.setAlpha(x, y, alpha)
-                else:
-                    image.setAlpha(x, y, 0.0)
-
-        texture = Texture("modern-crosshair")
-        texture.load(image)
-        texture.setWrapU(Texture.WMClamp)
-        texture.setWrapV(Texture.WMClamp)
-        texture.setMagfilter(Texture.FTLinear)
-        texture.setMinfilter(Texture.FTLinear)
-        return texture
+        return _baked_texture(cache_key, "modern-crosshair", lambda: _crosshair_pixels(size),
+                              Texture.WMClamp, Texture.FTLinear)
 
     return _cache_texture(cache_key, builder)
 
 
-def create_sky_texture(size: int = 1024) -> Texture:
+# GPU version of create_sky_texture's CPU path: same gradient, cloud noise and
+# blend, one invocation per texel. Rows are flipped because image rows run
+# bottom to top while the CPU builder counts them from the top.
+_SKY_COMPUTE_SHADER = """#version 430
+layout(local_size_x = 8, local_size_y = 8) in;
+layout(rgba8) uniform writeonly image2D skyTex;
+
+const vec3 topColor = vec3(0.08, 0.19, 0.44);
+const vec3 midColor = vec3(0.24, 0.46, 0.78);
+const vec3 horizonColor = vec3(0.80, 0.88, 0.97);
+const vec3 baseCloud = vec3(0.95, 0.97, 1.0);
+const vec3 shadowCloud = vec3(0.68, 0.74, 0.88);
+const vec3 highlight = vec3(1.0, 1.0, 0.92);
+const float cloudFloor = 0.42;
+const float coverage = 0.24;
+
+float hashNoise(vec2 cell) {
+    cell = mod(cell, 1024.0);
+    return fract(sin(cell.x * 12.9898 + cell.y * 78.233) * 43758.5453);
+}
+
+float perlinLike(vec2 p) {
+    vec2 cell = floor(p);
+    vec2 s = p - cell;
+    s = s * s * (3.0 - 2.0 * s);
+    float n0 = hashNoise(cell);
+    float n1 = hashNoise(cell + vec2(1.0, 0.0));
+    float n2 = hashNoise(cell + vec2(0.0, 1.0));
+    float n3 = hashNoise(cell + vec2(1.0, 1.0));
+    return mix(mix(n0, n1, s.x), mix(n2, n3, s.x), s.y);
+}
+
+void main() {
+    ivec2 texel = ivec2(gl_GlobalInvocationID.xy);
+    int size = imageSize(skyTex).x;
+    if (texel.x >= size || texel.y >= size) {
+        return;
+    }
+    float fsize = float(size);
+    vec2 p = vec2(float(texel.x), float(size - 1 - texel.y));
+    float t = p.y / (fsize - 1.0);
+
+    vec3 color = t < 0.55
+        ? mix(topColor, midColor, t / 0.55)
+        : mix(midColor, horizonColor, (t - 0.55) / 0.45);
+
+    float noise = (perlinLike(p / vec2(fsize / 4.0, fsize / 6.0) * 0.35)
+                   + perlinLike(p / (fsize / 9.0) * 0.9) * 0.9
+                   + perlinLike(p / (fsize / 25.0) * 1.8) * 0.55
+                   + perlinLike(p / (fsize / 80.0) * 3.7) * 0.35) / 2.0;
+
+    float threshold = cloudFloor - max(0.0, 1.0 - t * 1.2) * 0.2;
+    if (noise > threshold) {
+        float density = min(1.0, (noise - threshold) / coverage);
+        float softness = 0.45 + 0.4 * max(0.0, 1.0 - t * 0.85);
+        float mask = min(1.0, pow(max(density, 0.0), 0.55) * softness);
+        vec3 shaded = mix(baseCloud, shadowCloud, max(0.0, 0.6 - density) * 1.1);
+        color = mix(color, mix(shaded, highlight, min(1.0, density * 1.6)), mask);
+        if (density > 0.65) {
+            color += min(1.0, (density - 0.65) * 3.0) * vec3(0.12, 0.1, 0.08);
+        }
+    }
+    imageStore(skyTex, texel, vec4(clamp(color, 0.0, 1.0), 1.0));
+}
+"""
+
+
+@functools.lru_cache(maxsize=None)
+def _sky_compute_shader() -> Shader:
+    return Shader.makeCompute(Shader.SL_GLSL, _SKY_COMPUTE_SHADER)
+
+
+def _gpu_sky_texture(size: int, app) -> Optional[Texture]:
+    """Render the sky texture with a compute shader on ``app``'s window.
+
+    The pixels only ever exist in video memory. Returns None when there is
+    no window yet, its GSG cannot run compute shaders, or this is not the
+    main thread (e.g. a prewarm_textures worker), which is the only thread
+    allowed to dispatch on the GSG.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return None
+    win = getattr(app, "win", None)
+    gsg = win.getGsg() if win is not None else None
+    if gsg is None or not gsg.getSupportsComputeShaders():
+        return None
+
+    texture = Texture("sky-with-clouds")
+    texture.setup2dTexture(size, size, Texture.TUnsignedByte, Texture.FRgba8)
+    # No RAM image; the clear color just gives the GPU copy defined contents
+    texture.setClearColor((0, 0, 0, 1))
+    texture.setWrapU(Texture.WMClamp)
+    texture.setWrapV(Texture.WMClamp)
+    texture.setMagfilter(Texture.FTLinear)
+    texture.setMinfilter(Texture.FTLinear)
+
+    dispatcher = NodePath("sky-compute")
+    dispatcher.setShader(_sky_compute_shader())
+    dispatcher.setShaderInput("skyTex", texture, False, True, -1, 0)
+    groups = (size + 7) // 8
+    app.graphicsEngine.dispatchCompute((groups, groups, 1), dispatcher.getAttrib(ShaderAttrib), gsg)
+    return texture
+
+
+def create_sky_texture(size: int = 1024, app=None) -> Texture:
+    """Sky gradient with layered clouds.
+
+    When ``app`` is given, its window supports compute shaders and this is
+    the main thread, the texture is generated on the GPU; otherwise it is
+    built on the CPU.
+    """
     size = max(64, size)
     cache_key = f"sky-{size}"
 
     # Always rebuild the sky texture so visual changes appear immediately
-    if cache_key in _TEXTURE_CACHE:
-        del _TEXTURE_CACHE[cache_key]
+    with _CACHE_LOCK:
+        _TEXTURE_CACHE.pop(cache_key, None)
 
     def builder() -> Texture:
+        if app is not None:
+            texture = _gpu_sky_texture(size, app)
+            if texture is not None:
+                return texture
+
         # Define sky colors
         top_color = (0.08, 0.19, 0.44)      # Deep zenith blue
         mid_color = (0.24, 0.46, 0.78)      # Mid-level blue
         horizon_color = (0.80, 0.88, 0.97)  # Bright horizon
 
-        image = PNMImage(size, size, 4)
+        rgba = _scratch_rgba(size, size)
+        rgba[..., 3] = 1.0
 
         # Create sky gradient
         for y in range(size):
@@ -349,65 +665,37 @@ def create_sky_texture(size: int = 1024) -> Texture:
                 base_color = _lerp(top_color, mid_color, vertical_t / 0.55)
             else:
                 base_color = _lerp(mid_color, horizon_color, (vertical_t - 0.55) / 0.45)
-            for x in range(size):
-                image.setXel(x, y, *base_color)
-                image.setAlpha(x, y, 1.0)
+            rgba[y, :, :3] = base_color
 
         # Add clouds using layered Perlin noise with brighter highlights
-        base_cloud = (0.95, 0.97, 1.0)
-        shadow_cloud = (0.68, 0.74, 0.88)
-        highlight = (1.0, 1.0, 0.92)
+        base_cloud = np.array((0.95, 0.97, 1.0), dtype=np.float32)
+        shadow_cloud = np.array((0.68, 0.74, 0.88), dtype=np.float32)
+        highlight = np.array((1.0, 1.0, 0.92), dtype=np.float32)
+        rim_color = np.array((0.12, 0.1, 0.08), dtype=np.float32)
         cloud_floor = 0.42
         coverage = 0.24
 
-        for y in range(size):
-            vertical_factor = y / float(size - 1)
-            for x in range(size):
-                nx = x / (size / 4)
-                ny = y / (size / 6)
-
-                noise1 = _perlin_like_noise(nx, ny, 0.35)
-                noise2 = _perlin_like_noise(x / (size / 9), y / (size / 9), 0.9) * 0.9
-                noise3 = _perlin_like_noise(x / (size / 25), y / (size / 25), 1.8) * 0.55
-                detail = _perlin_like_noise(x / (size / 80), y / (size / 80), 3.7) * 0.35
-
-                noise_val = (noise1 + noise2 + noise3 + detail) / 2.0
-
-                horizon_boost = max(0.0, 1.0 - vertical_factor * 1.2) * 0.2
-                cloud_threshold = cloud_floor - horizon_boost
-
-                if noise_val > cloud_threshold:
-                    density = min(1.0, (noise_val - cloud_threshold) / max(coverage, 1e-5))
-                    softness = 0.45 + 0.4 * max(0.0, 1.0 - vertical_factor * 0.85)
-                    mask = min(1.0, max(0.0, density) ** 0.55 * softness)
-
-                    current_color = image.getXel(x, y)
-                    shaded = _lerp(base_cloud, shadow_cloud, max(0.0, 0.6 - density) * 1.1)
-                    cloud_color = _lerp(shaded, highlight, min(1.0, density * 1.6))
-                    final_color = (
-                        current_color[0] * (1 - mask) + cloud_color[0] * mask,
-                        current_color[1] * (1 - mask) + cloud_color[1] * mask,
-                        current_color[2] * (1 - mask) + cloud_color[2] * mask,
-                    )
-
-                    # Add bright silver linings near the top of clouds
-                    if density > 0.65:
-                        rim = min(1.0, (density - 0.65) * 3.0)
-                        final_color = (
-                            final_color[0] + rim * 0.12,
-                            final_color[1] + rim * 0.1,
-                            final_color[2] + rim * 0.08,
-                        )
-
-                    image.setXel(x, y, *tuple(min(1.0, max(0.0, c)) for c in final_color))
-
-        texture = Texture("sky-with-clouds")
-        texture.load(image)
-        texture.setWrapU(Texture.WMClamp)
-        texture.setWrapV(Texture.WMClamp)
-        texture.setMagfilter(Texture.FTLinear)
-        texture.setMinfilter(Texture.FTLinear)
-        return texture
+        # Blend every pixel at once: the threshold and softness vary per row only
+        vertical_factor = np.linspace(0.0, 1.0, size, dtype=np.float32)[:, None]
+        noise = _cloud_noise_grid(size)
+        horizon_boost = np.maximum(0.0, 1.0 - vertical_factor * 1.2) * 0.2
+        cloud_threshold = cloud_floor - horizon_boost
+        # Zero or negative outside the clouds, which zeroes their mask and rim
+        density = np.minimum(1.0, (noise - cloud_threshold) / max(coverage, 1e-5))
+        softness = 0.45 + 0.4 * np.maximum(0.0, 1.0 - vertical_factor * 0.85)
+        mask = np.minimum(1.0, np.maximum(density, 0.0) ** 0.55 * softness)
+
+        shade = np.maximum(0.0, 0.6 - density) * 1.1
+        shaded = _lerp_np(base_cloud, shadow_cloud, shade[..., None])
+        cloud_color = _lerp_np(shaded, highlight, np.minimum(1.0, density * 1.6)[..., None])
+        sky = rgba[..., :3]
+        sky += (cloud_color - sky) * mask[..., None]
+
+        # Add bright silver linings near the top of clouds
+        rim = np.clip((density - 0.65) * 3.0, 0.0, 1.0)
+        sky += rim[..., None] * rim_color
+
+        return _texture_from_rgba("sky-with-clouds", rgba, Texture.WMClamp, Texture.FTLinear)
 
     return _cache_texture(cache_key, builder)
 
@@ -416,25 +704,19 @@ def get_ui_panel_texture(size: int = 256) -> Texture:
     cache_key = f"ui-panel-{size}"
 
     def builder() -> Texture:
-        image = PNMImage(size, size, 4)
-        for y in range(size):
-            vertical = y / float(size - 1)
-            base = _lerp((0.06, 0.08, 0.12), (0.02, 0.03, 0.05), vertical)
-            for x in range(size):
-                horizon = x / float(size - 1)
-                highlight = _lerp((0.18, 0.26, 0.33), base, horizon * 0.6)
-                noise = (_hash_noise(x, y) - 0.5) * 0.05
-                color = tuple(max(0.0, min(1.0, c + noise)) for c in highlight)
-                image.setXel(x, y, *color)
-                alpha = 0.92 if 0.1 < vertical < 0.9 else 0.78
-                image.setAlpha(x, y, alpha)
-        texture = Texture("ui-panel")
-        texture.load(image)
-        texture.setWrapU(Texture.WMClamp)
-        texture.setWrapV(Texture.WMClamp)
-        texture.setMagfilter(Texture.FTLinear)
-        texture.setMinfilter(Texture.FTLinear)
-        return texture
+        xs, ys = _pixel_grid(size)
+        vertical = np.linspace(0.0, 1.0, size, dtype=np.float32)[:, None]
+        horizon = np.linspace(0.0, 1.0, size, dtype=np.float32)[None, :]
+        top = np.array((0.06, 0.08, 0.12), dtype=np.float32)
+        bottom = np.array((0.02, 0.03, 0.05), dtype=np.float32)
+        sheen = np.array((0.18, 0.26, 0.33), dtype=np.float32)
+        base = (top + (bottom - top) * vertical)[:, None, :]
+        weight = (horizon * 0.6)[..., None]
+        noise = (_hash_noise_grid(xs, ys) - 0.5) * 0.05
+        rgba = _scratch_rgba(size, size)
+        rgba[..., :3] = _lerp_np(sheen, base, weight) + noise[..., None]
+        rgba[..., 3] = np.where((vertical > 0.1) & (vertical < 0.9), 0.92, 0.78)
+        return _texture_from_rgba("ui-panel", rgba, Texture.WMClamp, Texture.FTLinear)
 
     return _cache_texture(cache_key, builder)
 
@@ -444,36 +726,40 @@ def create_icon_texture(kind: str, size: int = 128) -> Texture:
     cache_key = f"icon-{kind}-{size}"
 
     def builder() -> Texture:
-        image = PNMImage(size, size, 4)
-        for x in range(size):
-            for y in range(size):
-                image.setXel(x, y, 0, 0, 0)
-                image.setAlpha(x, y, 0.0)
+        rgba = _scratch_rgba(size, size)
+        rgba.fill(0.0)
         center = size / 2.0
         thickness = max(1, int(size * 0.06))
 
         def draw_dot(cx, cy, radius, color):
-            for x in range(size):
-                for y in range(size):
-                    dx = x - cx
-                    dy = y - cy
-                    if dx * dx + dy * dy <= radius * radius:
-                        image.setXel(x, y, *color)
-                        image.setAlpha(x, y, 1.0)
+            # Only the dot's bounding box is tested
+            x0 = max(0, int(math.floor(cx - radius)))
+            x1 = min(size, int(math.ceil(cx + radius)) + 1)
+            y0 = max(0, int(math.floor(cy - radius)))
+            y1 = min(size, int(math.ceil(cy + radius)) + 1)
+            dx = np.arange(x0, x1, dtype=np.float32)[None, :] - cx
+            dy = np.arange(y0, y1, dtype=np.float32)[:, None] - cy
+            rgba[y0:y1, x0:x1][dx * dx + dy * dy <= radius * radius] = (*color, 1.0)
 
         def draw_line(x0, y0, x1, y1, color):
             steps = int(max(abs(x1 - x0), abs(y1 - y0)))
-            for i in range(steps + 1):
-                t = i / float(max(steps, 1))
-                x = int(round(x0 + (x1 - x0) * t))
-                y = int(round(y0 + (y1 - y0) * t))
-                for dx in range(-thickness, thickness + 1):
-                    for dy in range(-thickness, thickness + 1):
-                        px = x + dx
-                        py = y + dy
-                        if 0 <= px < size and 0 <= py < size:
-                            image.setXel(px, py, *color)
-                            image.setAlpha(px, py, 1.0)
+            t = np.linspace(0.0, 1.0, steps + 1, dtype=np.float32)
+            # Rasterize onto a canvas padded by the brush size so brushes
+            # centered just outside the image still paint its edge
+            padded = size + 2 * thickness
+            px = np.round(x0 + (x1 - x0) * t).astype(np.intp) + thickness
+            py = np.round(y0 + (y1 - y0) * t).astype(np.intp) + thickness
+            keep = (px >= 0) & (px < padded) & (py >= 0) & (py < padded)
+            points = np.zeros((padded, padded), dtype=bool)
+            points[py[keep], px[keep]] = True
+            # Square brush as two separable dilations, along x then along y
+            rows = np.zeros((padded, size), dtype=bool)
+            for offset in range(2 * thickness + 1):
+                rows |= points[:, offset:offset + size]
+            brush = np.zeros((size, size), dtype=bool)
+            for offset in range(2 * thickness + 1):
+                brush |= rows[offset:offset + size, :]
+            rgba[brush] = (*color, 1.0)
 
         accent = (0.94, 0.82, 0.42)
         base = (0.78, 0.88, 0.95)
@@ -488,25 +774,14 @@ def create_icon_texture(kind: str, size: int = 128) -> Texture:
         elif kind == 'accuracy':
             radius_outer = size * 0.32
             radius_inner = size * 0.06
-            for x in range(size):
-                for y in range(size):
-                    dx = x - center
-                    dy = y - center
-                    dist = math.sqrt(dx * dx + dy * dy)
-                    if abs(dist - radius_outer) <= thickness * 0.7 or dist <= radius_inner:
-                        image.setXel(x, y, *base)
-                        image.setAlpha(x, y, 1.0)
+            xs, ys = _pixel_grid(size)
+            dist = np.hypot(xs - center, ys - center)
+            rgba[(np.abs(dist - radius_outer) <= thickness * 0.7) | (dist <= radius_inner)] = (*base, 1.0)
         else:  # score or default icon
             draw_dot(center, center, size * 0.18, accent)
             draw_dot(center, center, size * 0.1, base)
 
-        texture = Texture(f"icon-{kind}")
-        texture.load(image)
-        texture.setWrapU(Texture.WMClamp)
-        texture.setWrapV(Texture.WMClamp)
-        texture.setMagfilter(Texture.FTLinear)
-        texture.setMinfilter(Texture.FTLinear)
-        return texture
+        return _texture_from_rgba(f"icon-{kind}", rgba, Texture.WMClamp, Texture.FTLinear)
 
     return _cache_texture(cache_key, builder)
 
@@ -515,28 +790,8 @@ def create_track_texture(size: int = 64) -> Texture:
     cache_key = f"track-{size}"
 
     def builder() -> Texture:
-        image = PNMImage(size, size, 4)
-        center = size / 2.0
-        for x in range(size):
-            for y in range(size):
-                dx = (x - center) / center
-                dy = (y - center) / center
-                dist = math.sqrt(dx * dx + dy * dy)
-                if dist > 1.0:
-                    image.setAlpha(x, y, 0.0)
-                    continue
-                depth = (1.0 - dist) ** 2
-                color = 0.25 + depth * 0.45
-                image.setXel(x, y, color, color * 0.75, 0.28)
-                image.setAlpha(x, y, min(1.0, depth * 2.5))
-
-        texture = Texture("wildlife-track")
-        texture.load(image)
-        texture.setWrapU(Texture.WMClamp)
-        texture.setWrapV(Texture.WMClamp)
-        texture.setMagfilter(Texture.FTLinear)
-        texture.setMinfilter(Texture.FTLinear)
-        return texture
+        return _baked_texture(cache_key, "wildlife-track", lambda: _track_pixels(size),
+                              Texture.WMClamp, Texture.FTLinear)
 
     return _cache_texture(cache_key, builder)
 
@@ -545,29 +800,7 @@ def create_water_texture(size: int = 256) -> Texture:
     cache_key = f"water-{size}"
 
     def builder() -> Texture:
-        image = PNMImage(size, size, 4)
-        center = size / 2.0
-        for x in range(size):
-            for y in range(size):
-                dx = (x - center) / center
-                dy = (y - center) / center
-                r = math.sqrt(dx * dx + dy * dy)
-                if r > 1.0:
-                    image.setAlpha(x, y, 0.0)
-                    continue
-                base = _lerp((0.08, 0.21, 0.32), (0.12, 0.35, 0.48), r)
-                ripple = math.sin(r * 14.0) * 0.03 + (_hash_noise(x, y) - 0.5) * 0.02
-                color = tuple(max(0.0, min(1.0, c + ripple)) for c in base)
-                image.setXel(x, y, *color)
-                alpha = max(0.25, 1.0 - r * 0.7)
-                image.setAlpha(x, y, alpha)
-
-        texture = Texture("water-surface")
-        texture.load(image)
-        texture.setWrapU(Texture.WMClamp)
-        texture.setWrapV(Texture.WMClamp)
-        texture.setMagfilter(Texture.FTLinear)
-        texture.setMinfilter(Texture.FTLinearMipmapLinear)
-        return texture
+        rgba = _water_pixels(size)
+        return _texture_from_rgba("water-surface", rgba, Texture.WMClamp, Texture.FTLinearMipmapLinear)
 
     return _cache_texture(cache_key, builder)
@@ -2,15 +2,171 @@
 Dynamic weather system with precipitation particles, wind, and atmospheric effects.
 """
 
+import builtins
+from collections import namedtuple
+from enum import IntEnum
+import functools
 import random
-import math
+from types import MappingProxyType
+from typing import Final
+
+import numpy as np
 from panda3d.core import (
-    Vec3, PointLight, NodePath, CardMaker,
-    PTAFloat, VBase4, TransformState, LVector3, Fog, AmbientLight,
+    Vec3, Vec4, Point3, BoundingBox,
+    PTAFloat, VBase4, Fog, AmbientLight,
     TransparencyAttrib, GeomNode, Geom, GeomVertexFormat, GeomVertexData,
-    GeomVertexWriter, GeomTriangles
+    GeomVertexArrayFormat, GeomVertexWriter, GeomTristrips,
+    GeomLines, GeomPoints, InternalName, Shader
 )
 
+from graphics._weather_kernels import step_precipitation as _step_precipitation_kernel
+
+__all__ = [
+    'PrecipitationParticles', 'WeatherSystem', 'WeatherKind', 'WeatherPreset', 'get_preset',
+    'WEATHER_PRESETS', 'WeatherPresets', 'PRESETS',
+]
+
+
+# Smallest changes worth sending to Panda: weather fog densities stay under
+# 0.02, and colors end up as 8-bit channels
+_FOG_DENSITY_EPSILON = 1e-4
+_COLOR_EPSILON = 1.0 / 255.0
+
+# Weather strength is quantized to this many steps for the visuals below
+_VISUAL_LUT_STEPS = 64
+
+
+def _weather_visual_lut(max_density, fog_fade, light_drop):
+    """Precompute (fog density, fog color, ambient level) at every strength step.
+
+    At full strength the fog reaches ``max_density``, its color drops by
+    ``fog_fade`` per channel from white and the ambient level by ``light_drop``.
+    """
+    table = []
+    for step in range(_VISUAL_LUT_STEPS + 1):
+        strength = step / _VISUAL_LUT_STEPS
+        color = (1 - fog_fade[0] * strength, 1 - fog_fade[1] * strength, 1 - fog_fade[2] * strength)
+        table.append((max_density * strength, color, 1.0 - light_drop * strength))
+    return tuple(table)
+
+
+_WEATHER_VISUALS = {
+    'rain': _weather_visual_lut(0.01, (0.3, 0.2, 0.1), 0.5),
+    'snow': _weather_visual_lut(0.005, (0.1, 0.1, 0.05), 0.3),
+}
+_CLEAR_VISUALS = (0.0, (1.0, 1.0, 1.0), 1.0)
+
+def _fog_noise_table(size=128, seed=7):
+    """Smooth looping noise in -1..1: a random walk with its drift removed."""
+    rng = np.random.default_rng(seed)
+    walk = np.cumsum(rng.normal(0.0, 0.02, size))
+    walk -= np.linspace(0.0, walk[-1], size)
+    walk /= max(np.max(np.abs(walk)), 1e-6)
+    return tuple(walk.tolist())
+
+
+# Fog weather density drifts through this table at _FOG_NOISE_RATE entries
+# per second, by up to _FOG_NOISE_DEPTH of the base density
+_FOG_NOISE = _fog_noise_table()
+_FOG_NOISE_RATE = 2.0
+_FOG_NOISE_DEPTH = 0.1
+
+# Mean lightning strikes per second during storms (a 0.2% chance per frame at 60 FPS)
+_LIGHTNING_RATE = 0.12
+
+
+# Instanced precipitation: one quad drawn once per particle. Each instance
+# carries its spawn position (xyz) and size (w); the vertex shader drops it by
+# the accumulated fall distance, wraps it back under the ceiling at a new spot,
+# and billboards the quad in eye space. GLSL 1.20 like the post-processing
+# shaders: the per-instance data comes from the divisor-1 `spawn` column, so
+# the shader needs no gl_InstanceID and still runs on legacy GL 2.1 contexts.
+_PRECIP_VERT = """#version 120
+uniform mat4 p3d_ModelViewMatrix;
+uniform mat4 p3d_ProjectionMatrix;
+uniform float fall;
+uniform vec4 area;  // x: spawn radius, y: height ceiling, zw: card half size
+attribute vec4 p3d_Vertex;
+attribute vec4 spawn;
+
+void main() {
+    float span = area.y + 1.0;
+    float drop = spawn.z + 1.0 - fall;
+    float cycle = floor(drop / span);
+    vec3 pos = vec3(spawn.xy, drop - cycle * span - 1.0);
+    pos.xy = mod(pos.xy + area.x - cycle * vec2(13.7, 29.3), 2.0 * area.x) - area.x;
+    vec4 eye = p3d_ModelViewMatrix * vec4(pos, 1.0);
+    eye.xy += p3d_Vertex.xz * area.zw * spawn.w;
+    gl_Position = p3d_ProjectionMatrix * eye;
+}
+"""
+
+_PRECIP_FRAG = """#version 120
+uniform vec4 tint;
+uniform float weather[5];  // see WeatherSystem._weather_pta
+
+void main() {
+    gl_FragColor = vec4(tint.rgb * weather[4], tint.a);
+}
+"""
+
+
+@functools.lru_cache(maxsize=None)
+def _precipitation_shader():
+    return Shader.make(Shader.SL_GLSL, _PRECIP_VERT, _PRECIP_FRAG)
+
+
+@functools.lru_cache(maxsize=None)
+def _precipitation_format():
+    """Vertex format with the quad corners in array 0 and per-instance spawn data in array 1."""
+    corners = GeomVertexArrayFormat()
+    corners.addColumn(InternalName.getVertex(), 3, Geom.NTFloat32, Geom.CPoint)
+    instances = GeomVertexArrayFormat()
+    instances.addColumn(InternalName.make('spawn'), 4, Geom.NTFloat32, Geom.COther)
+    instances.setDivisor(1)
+    vformat = GeomVertexFormat()
+    vformat.addArray(corners)
+    vformat.addArray(instances)
+    return GeomVertexFormat.registerFormat(vformat)
+
+
+# Unit-square x/y offsets for respawning CPU-path particles, sampled once and
+# then walked through in order instead of drawing fresh randoms every frame
+_RESPAWN_OFFSETS = np.random.uniform(-1.0, 1.0, (4096, 2)).astype(np.float32)
+
+
+def _find_app(render_node):
+    """Return the ShowBase instance driving ``render_node``, or None."""
+    app = render_node.getNetPythonTag('base_app') if hasattr(render_node, 'getNetPythonTag') else None
+    if app is None:
+        import __main__
+        app = getattr(__main__, 'app', None)
+    if app is None:
+        app = getattr(builtins, 'base', None)
+    return app
+
+
+def _window_gsg(render_node):
+    app = _find_app(render_node)
+    win = getattr(app, 'win', None)
+    return win.getGsg() if win is not None else None
+
+
+def _supports_instanced_precipitation(render_node):
+    """Whether the window's GSG can run the instanced precipitation shader."""
+    gsg = _window_gsg(render_node)
+    return bool(gsg and gsg.getSupportsGlsl() and gsg.getSupportsGeometryInstancing())
+
+
+def _prepare_precipitation_shader(render_node):
+    """Queue the precipitation shader for compilation on the window's GSG.
+
+    Otherwise it is compiled the first frame rain or snow is drawn. The
+    compiled program is kept by the GSG and reused by every later shower.
+    """
+    if _supports_instanced_precipitation(render_node):
+        _precipitation_shader().prepare(_window_gsg(render_node).getPreparedObjects())
+
 
 class PrecipitationParticles:
     """Manages visible rain/snow particle billboards."""
@@ -19,61 +175,193 @@ class PrecipitationParticles:
         self.render = render_node
         self.weather_type = weather_type
         self.particle_node = None
-        self.particles = []
         self._particle_count = 0
         self._spawn_radius = 40.0
         self._height_ceiling = 25.0
         self._fall_speed = 18.0 if weather_type == 'rain' else 3.5
         self._active = False
+        # Shader input holding the accumulated fall distance (instanced path only)
+        self._fall = None
+        self._quad = None
+        # CPU path: particle positions (N, 3), the vertices built from them
+        # (N, vertices per particle, 3) and the Geom they are copied into
+        self._pos = None
+        self._verts = None
+        self._vertex_offsets = None
+        self._geom = None
+        # Particles built so far; release() keeps them for the next start()
+        self._capacity = 0
+        self._respawn_index = 0
 
     def start(self, strength=1.0):
         if self._active:
             return
         self._active = True
-        self._particle_count = int(800 * strength) if self.weather_type == 'rain' else int(300 * strength)
-        self.particle_node = self.render.attachNewNode(f'precipitation_{self.weather_type}')
-        self._spawn_particles()
+        count = int(800 * strength) if self.weather_type == 'rain' else int(300 * strength)
+        if self.particle_node is not None and count <= self._capacity:
+            self.particle_node.unstash()
+        else:
+            self._destroy_particles()
+            self._particle_count = count
+            self.particle_node = self.render.attachNewNode(f'precipitation_{self.weather_type}')
+            if _supports_instanced_precipitation(self.render):
+                self._spawn_instanced()
+            else:
+                self._spawn_particles()
+            self._capacity = count
+        self._set_live_count(count)
+
+    def _set_live_count(self, count):
+        """Draw and animate only the first ``count`` built particles."""
+        self._particle_count = count
+        if self._quad is not None:
+            self._quad.setInstanceCount(count)
+            return
+        primitive = self._geom.modifyPrimitive(0)
+        primitive.clearVertices()
+        primitive.addConsecutiveVertices(0, count * len(self._vertex_offsets))
+
+    def _fall_volume(self):
+        """Bounds covering every position a particle can fall through."""
+        r = self._spawn_radius + 1.0
+        return BoundingBox(Point3(-r, -r, -2.0), Point3(r, r, self._height_ceiling + 1.0))
+
+    def _spawn_instanced(self):
+        """Build every particle as one instanced quad animated by the vertex shader."""
+        vdata = GeomVertexData('precip_instances', _precipitation_format(), Geom.UHStatic)
+        corner = GeomVertexWriter(vdata, 'vertex')
+        for x, z in ((-1, -1), (1, -1), (-1, 1), (1, 1)):
+            corner.addData3(x, 0, z)
+        # Sample every particle's spawn x, y, z and size at once
+        count = self._particle_count
+        spawn = np.empty((count, 4), dtype=np.float32)
+        spawn[:, :2] = np.random.uniform(-self._spawn_radius, self._spawn_radius, (count, 2))
+        spawn[:, 2] = np.random.uniform(0.0, self._height_ceiling, count)
+        spawn[:, 3] = np.random.uniform(0.5, 1.8, count) if self.weather_type == 'snow' else 1.0
+        vdata.modifyArray(1).modifyHandle().copyDataFrom(spawn)
+
+        strip = GeomTristrips(Geom.UHStatic)
+        strip.addConsecutiveVertices(0, 4)
+        strip.closePrimitive()
+        geom = Geom(vdata)
+        geom.addPrimitive(strip)
+        node = GeomNode('precip_instanced')
+        node.addGeom(geom)
+        # The shader moves the particles, so bound the whole fall volume and
+        # keep Panda from shrinking it to the corner quad
+        node.setBounds(self._fall_volume())
+        node.setFinal(True)
+
+        self._fall = PTAFloat.emptyArray(1)
+        if self.weather_type == 'rain':
+            half_size = (0.03, 0.4)
+            tint = Vec4(0.65, 0.72, 0.85, 0.55)
+        else:
+            half_size = (0.15, 0.15)
+            tint = Vec4(0.95, 0.97, 1.0, 0.8)
+        quad = self._quad = self.particle_node.attachNewNode(node)
+        quad.setInstanceCount(self._particle_count)
+        quad.setShader(_precipitation_shader())
+        quad.setShaderInput('fall', self._fall)
+        quad.setShaderInput('area', Vec4(self._spawn_radius, self._height_ceiling, *half_size))
+        quad.setShaderInput('tint', tint)
 
     def _spawn_particles(self):
-        cm = CardMaker('precip_card')
+        """Build every particle into one CPU-animated Geom: a line per raindrop, a point per flake.
+
+        Positions are kept in a float32 array so update() moves them all at
+        once and copies the resulting vertices into the Geom in one write.
+        """
+        count = self._particle_count
+        r = self._spawn_radius
+        self._pos = np.empty((count, 3), dtype=np.float32)
+        self._pos[:, :2] = np.random.uniform(-r, r, (count, 2))
+        self._pos[:, 2] = np.random.uniform(0.0, self._height_ceiling, count)
+
         if self.weather_type == 'rain':
-            cm.setFrame(-0.03, 0.03, -0.4, 0.4)
+            self._vertex_offsets = np.array([(0.0, 0.0, 0.4), (0.0, 0.0, -0.4)], dtype=np.float32)
+            primitive = GeomLines(Geom.UHDynamic)
+            tint = (0.65, 0.72, 0.85, 0.55)
         else:
-            cm.setFrame(-0.15, 0.15, -0.15, 0.15)
-        for _ in range(self._particle_count):
-            card = self.particle_node.attachNewNode(cm.generate())
-            card.setTransparency(TransparencyAttrib.MAlpha)
-            card.setBillboardPointEye()
-            card.setPos(
-                random.uniform(-self._spawn_radius, self._spawn_radius),
-                random.uniform(-self._spawn_radius, self._spawn_radius),
-                random.uniform(0, self._height_ceiling)
-            )
-            if self.weather_type == 'rain':
-                card.setColorScale(0.65, 0.72, 0.85, 0.55)
-            else:
-                card.setColorScale(0.95, 0.97, 1.0, 0.8)
-                card.setScale(random.uniform(0.5, 1.8))
-            card.setShaderAuto()
-            self.particles.append(card)
+            self._vertex_offsets = np.zeros((1, 3), dtype=np.float32)
+            primitive = GeomPoints(Geom.UHDynamic)
+            tint = (0.95, 0.97, 1.0, 0.8)
+        self._verts = np.empty((count, len(self._vertex_offsets), 3), dtype=np.float32)
+
+        vdata = GeomVertexData('precip_cpu', GeomVertexFormat.getV3(), Geom.UHDynamic)
+        vdata.uncleanSetNumRows(count * len(self._vertex_offsets))
+        primitive.addConsecutiveVertices(0, count * len(self._vertex_offsets))
+        self._geom = Geom(vdata)
+        self._geom.addPrimitive(primitive)
+        node = GeomNode('precip_cpu')
+        node.addGeom(self._geom)
+        node.setBounds(self._fall_volume())
+        node.setFinal(True)
+
+        particles = self.particle_node.attachNewNode(node)
+        particles.setColor(*tint)
+        if self.weather_type == 'rain':
+            particles.setRenderModeThickness(1.5)
+        else:
+            particles.setRenderModeThickness(0.3)
+            particles.setRenderModePerspective(True)
+        self._upload_positions()
+
+    def _upload_positions(self):
+        """Rebuild the vertices from the particle positions and copy them into the Geom."""
+        np.add(self._pos[:, None, :], self._vertex_offsets, out=self._verts)
+        self._copy_vertices()
+
+    def _copy_vertices(self):
+        vdata = self._geom.modifyVertexData()
+        vdata.modifyArray(0).modifyHandle().copyDataFrom(self._verts)
 
     def update(self, dt, strength=1.0):
         if not self._active or not self.particle_node:
             return
-        for p in self.particles:
-            z = p.getZ() - self._fall_speed * strength * dt
-            if z < -1.0:
-                z = self._height_ceiling
-                p.setX(random.uniform(-self._spawn_radius, self._spawn_radius))
-                p.setY(random.uniform(-self._spawn_radius, self._spawn_radius))
-            p.setZ(z)
+        if self._fall is not None:
+            # Wrap after many full drops so the float keeps its precision
+            wrap = (self._height_ceiling + 1.0) * 64.0
+            self._fall[0] = (self._fall[0] + self._fall_speed * strength * dt) % wrap
+            return
+        drop = self._fall_speed * strength * dt
+        if _step_precipitation_kernel is not None:
+            _step_precipitation_kernel(self._pos, self._vertex_offsets, self._verts,
+                                       drop, self._height_ceiling, self._spawn_radius)
+            self._copy_vertices()
+            return
+        pos = self._pos
+        pos[:, 2] -= drop
+        landed = pos[:, 2] < -1.0
+        respawns = np.count_nonzero(landed)
+        if respawns:
+            rows = np.arange(self._respawn_index, self._respawn_index + respawns) % len(_RESPAWN_OFFSETS)
+            self._respawn_index = (self._respawn_index + respawns) % len(_RESPAWN_OFFSETS)
+            pos[landed, 2] = self._height_ceiling
+            pos[landed, :2] = _RESPAWN_OFFSETS[rows] * self._spawn_radius
+        self._upload_positions()
+
+    def release(self):
+        """Hide the particles but keep them, so a later start() skips rebuilding."""
+        if self.particle_node:
+            self.particle_node.stash()
+        self._active = False
 
     def stop(self):
+        self._destroy_particles()
+        self._active = False
+
+    def _destroy_particles(self):
         if self.particle_node:
             self.particle_node.removeNode()
             self.particle_node = None
-        self.particles.clear()
-        self._active = False
+        self._pos = None
+        self._verts = None
+        self._vertex_offsets = None
+        self._geom = None
+        self._fall = None
+        self._quad = None
+        self._capacity = 0
 
 
 class WeatherSystem:
@@ -87,6 +375,15 @@ class WeatherSystem:
         self.wind_direction = Vec3(1, 0, 0)
         self.precipitation = None
         self._precip_particles = None
+        # Released precipitation systems by weather type, ready to be restarted
+        self._precip_pool = {}
+        # Shared parent for all precipitation; blending, depth and bin state
+        # is set here once and inherited by every particle system
+        self.particles_root = self.render.attachNewNode('weather_particles')
+        self.particles_root.setTransparency(TransparencyAttrib.MAlpha)
+        self.particles_root.setDepthWrite(False)
+        self.particles_root.setBin('transparent', 40)
+        _prepare_precipitation_shader(self.render)
         self.fog_effect = None
         self.lightning_active = False
         self.thunder_active = False
@@ -98,15 +395,40 @@ class WeatherSystem:
         self.fog = Fog('weather_fog')
         self.fog.setColor(1, 1, 1)
         self.fog.setMode(Fog.MExponential)
+        self.fog.setExpDensity(0.0)
 
         # Ambient light — use a lower-priority approach that doesn't clear existing lights
         self.ambient_light = AmbientLight('weather_ambient')
         self.ambient_light.setColor(VBase4(1, 1, 1, 1))
+        # Last fog density, fog color (r, g, b) and ambient level sent to Panda
+        self._sent_density = 0.0
+        self._sent_fog_color = (1.0, 1.0, 1.0)
+        self._sent_ambient = 1.0
+        # The same values for custom shaders, as a 'weather' input on render:
+        # fog density, fog r, g, b, ambient level. Written in place on change.
+        self._weather_pta = PTAFloat.emptyArray(5)
+        self._weather_pta[1] = self._weather_pta[2] = self._weather_pta[3] = 1.0
+        self._weather_pta[4] = 1.0
+        self.render.setShaderInput('weather', self._weather_pta)
+
+        # Seconds of weather simulated, and when the next storm strike is due
+        self._clock = 0.0
+        self._next_lightning_t = None
+        # When the current lightning flash ends, or None between flashes
+        self._flash_end_t = None
+
+        # False once update_weather has applied a steady state it can skip
+        self._is_dirty = True
 
         # Weather transition parameters
         self.transition_time = 0
         self.target_weather = 'clear'
         self.target_strength = 0.0
+        # Visibility, temperature and precipitation (see WeatherPreset), blended
+        # from the conditions at the last set_weather towards the target preset
+        self._conditions = _PRESET_ARRAY[WeatherKind.CLEAR].copy()
+        self._conditions_from = self._conditions.copy()
+        self._conditions_to = _PRESET_ARRAY[WeatherKind.CLEAR]
 
     def _ensure_weather_fog_and_light(self):
         """Lazily attach fog and ambient light so they don't conflict with DynamicLighting init."""
@@ -126,7 +448,13 @@ class WeatherSystem:
 
     def update_weather(self, dt):
         """Update weather conditions and visual effects."""
+        # Steady weather with nothing animating needs no work at all
+        if not self._is_dirty and self.transition_time <= 0:
+            return
         self._ensure_weather_fog_and_light()
+        self._clock += dt
+        if self._flash_end_t is not None and self._clock >= self._flash_end_t:
+            self._end_flash()
 
         # Gradual weather transitions
         if self.transition_time > 0:
@@ -137,14 +465,15 @@ class WeatherSystem:
                 self.current_weather = self.target_weather
                 self.weather_strength = self.target_strength
                 self.transition_time = 0
+                self._conditions[:] = self._conditions_to
             else:
                 self.weather_strength = self.weather_strength * (1 - progress) + self.target_strength * progress
+                p = max(0.0, progress)
+                self._conditions[:] = self._conditions_from * (1.0 - p) + self._conditions_to * p
 
         # Update particle effects
         if self._precip_particles:
             self._precip_particles.update(dt, self.weather_strength)
-        elif self.current_weather in ('rain', 'snow'):
-            self.update_precipitation(dt)
 
         # Update fog effects for foggy weather
         if self.current_weather == 'fog':
@@ -156,25 +485,30 @@ class WeatherSystem:
         # Update visual effects
         self.update(dt)
 
+        # Outside a transition, the visuals only keep changing while particles
+        # fall, fog drifts, storms can strike or a flash is still showing
+        self._is_dirty = (
+            self._precip_particles is not None
+            or self.current_weather in ('fog', 'storm')
+            or self._flash_end_t is not None
+        )
+
     def set_weather(self, weather_type, strength=0.0, transition_time=10.0):
         """Change weather with smooth transition."""
         self.target_weather = weather_type
         self.target_strength = strength
         self.transition_time = transition_time
+        self._is_dirty = True
+        kind = _WEATHER_KINDS.get(weather_type)
+        if kind is not None:
+            self._conditions_from = self._conditions.copy()
+            self._conditions_to = _PRESET_ARRAY[kind]
 
         # Start/stop precipitation particles
         if weather_type in ('rain', 'storm') and strength > 0.3:
-            if self._precip_particles is None or self._precip_particles.weather_type != 'rain':
-                if self._precip_particles:
-                    self._precip_particles.stop()
-                self._precip_particles = PrecipitationParticles(self.render, 'rain')
-                self._precip_particles.start(strength)
+            self._start_precipitation('rain', strength)
         elif weather_type == 'snow' and strength > 0.3:
-            if self._precip_particles is None or self._precip_particles.weather_type != 'snow':
-                if self._precip_particles:
-                    self._precip_particles.stop()
-                self._precip_particles = PrecipitationParticles(self.render, 'snow')
-                self._precip_particles.start(strength)
+            self._start_precipitation('snow', strength)
         else:
             self._stop_precipitation()
 
@@ -187,76 +521,92 @@ class WeatherSystem:
     def _start_rain(self):
         """Create rain particle effect."""
         strength = max(self.weather_strength, self.target_strength)
-        self.fog.setExpDensity(0.01 * strength)
-        self.fog.setColor(0.7, 0.8, 0.9)
-        self.ambient_light.setColor(VBase4(0.5, 0.5, 0.5, 1))
+        self._set_fog(0.01 * strength, (0.7, 0.8, 0.9))
+        self._set_ambient(0.5)
 
     def _start_snow(self):
         """Create snow particle effect."""
         strength = max(self.weather_strength, self.target_strength)
-        self.fog.setExpDensity(0.005 * strength)
-        self.fog.setColor(0.9, 0.9, 0.95)
-        self.ambient_light.setColor(VBase4(0.7, 0.7, 0.7, 1))
+        self._set_fog(0.005 * strength, (0.9, 0.9, 0.95))
+        self._set_ambient(0.7)
+
+    def _start_precipitation(self, weather_type, strength):
+        """Show rain or snow particles, reusing a released system of that type."""
+        if self._precip_particles is not None:
+            if self._precip_particles.weather_type == weather_type:
+                return
+            self._release_precipitation()
+        particles = self._precip_pool.pop(weather_type, None)
+        if particles is None:
+            particles = PrecipitationParticles(self.particles_root, weather_type)
+        particles.start(strength)
+        self._precip_particles = particles
+
+    def _release_precipitation(self):
+        """Hide the active particles and keep them in the pool."""
+        particles = self._precip_particles
+        if particles is not None:
+            particles.release()
+            self._precip_pool[particles.weather_type] = particles
+            self._precip_particles = None
 
     def _stop_precipitation(self):
         """Remove precipitation effects."""
-        if self._precip_particles:
-            self._precip_particles.stop()
-            self._precip_particles = None
-        self.fog.setExpDensity(0.0)
-        self.fog.setColor(1, 1, 1)
-        self.ambient_light.setColor(VBase4(1, 1, 1, 1))
+        self._release_precipitation()
+        self._set_fog(0.0, (1.0, 1.0, 1.0))
+        self._set_ambient(1.0)
     
     def _start_fog(self):
         """Add fog layer for weather effects."""
-        self.fog.setExpDensity(0.02)
-        self.fog.setColor(0.8, 0.8, 0.8)
-        self.ambient_light.setColor(VBase4(0.6, 0.6, 0.6, 1))
+        self._set_fog(0.02, (0.8, 0.8, 0.8))
+        self._set_ambient(0.6)
         
     def _stop_fog(self):
         """Remove fog effects."""
-        self.fog.setExpDensity(0.0)
-        self.fog.setColor(1, 1, 1)
-        self.ambient_light.setColor(VBase4(1, 1, 1, 1))
+        self._set_fog(0.0, (1.0, 1.0, 1.0))
+        self._set_ambient(1.0)
     
     def update_fog_effect(self, dt):
         """Update moving fog effects."""
         if self.current_weather == 'fog':
-            density = 0.02 * self.weather_strength
-            self.fog.setExpDensity(density)
+            # Interpolate between neighbouring noise entries along the weather clock
+            pos = (self._clock * _FOG_NOISE_RATE) % len(_FOG_NOISE)
+            i = int(pos)
+            a = _FOG_NOISE[i]
+            b = _FOG_NOISE[(i + 1) % len(_FOG_NOISE)]
+            noise = a + (b - a) * (pos - i)
+            density = 0.02 * self.weather_strength * (1.0 + _FOG_NOISE_DEPTH * noise)
+            self._set_fog(density, self._sent_fog_color)
     
     def _check_weather_events(self):
         """Random weather events like thunder/lightning."""
-        # Lightning events during storms
-        if self.current_weather == 'storm' and random.random() < 0.002:
+        # Lightning events during storms. Strikes form a Poisson process, so
+        # the gap to the next one is drawn once per strike, not rolled per frame.
+        if self.current_weather != 'storm':
+            self._next_lightning_t = None
+            return
+        if self._next_lightning_t is not None and self._clock >= self._next_lightning_t:
             self._trigger_lightning()
+            self._next_lightning_t = None
+        if self._next_lightning_t is None:
+            self._next_lightning_t = self._clock + random.expovariate(_LIGHTNING_RATE)
         
     def _trigger_lightning(self):
         """Create lightning flash effect."""
-        # Flash ambient light bright white briefly
-        if hasattr(self, 'ambient_light'):
-            original = self.ambient_light.getColor()
-            self.ambient_light.setColor(VBase4(2.0, 2.0, 2.5, 1.0))
-            # Restore after brief flash
-            from direct.task import Task
-            def restore_light(task):
-                self.ambient_light.setColor(original)
-                return task.done
-            # Schedule delayed restoration via the render node's task chain
-            try:
-                from direct.task import Task
-                if hasattr(self.render, 'getPythonTag'):
-                    base_ref = self.render.getPythonTag('base_app')
-                else:
-                    base_ref = None
-                if base_ref is None:
-                    import __main__
-                    base_ref = getattr(__main__, 'app', None)
-                if base_ref and hasattr(base_ref, 'taskMgr'):
-                    base_ref.taskMgr.doMethodLater(0.08, restore_light, 'restore_lightning')
-            except Exception:
-                pass
-        
+        # Flash ambient light bright white briefly; update_weather restores it
+        self.ambient_light.setColor(VBase4(2.0, 2.0, 2.5, 1.0))
+        self._flash_end_t = self._clock + 0.08
+
+    def _end_flash(self):
+        """Return the ambient light from a lightning flash to the weather level."""
+        level = self._sent_ambient
+        self.ambient_light.setColor(VBase4(level, level, level, 1))
+        self._flash_end_t = None
+
+    def get_conditions(self):
+        """Return the current, possibly mid-transition, visibility, temperature and precipitation."""
+        return WeatherPreset(*self._conditions.tolist())
+
     def get_wetness_factor(self):
         """Return wetness for material dampening."""
         if self.current_weather == 'rain':
@@ -277,22 +627,41 @@ class WeatherSystem:
 
     def update(self, dt):
         """Update weather effects based on current state."""
-        if self.current_weather == 'rain':
-            density = 0.01 * self.weather_strength
-            color = VBase4(1 - 0.3 * self.weather_strength, 1 - 0.2 * self.weather_strength, 1 - 0.1 * self.weather_strength, 1)
-            light_factor = 1.0 - 0.5 * self.weather_strength
-        elif self.current_weather == 'snow':
-            density = 0.005 * self.weather_strength
-            color = VBase4(1 - 0.1 * self.weather_strength, 1 - 0.1 * self.weather_strength, 1 - 0.05 * self.weather_strength, 1)
-            light_factor = 1.0 - 0.3 * self.weather_strength
+        if self.current_weather == 'fog':
+            # Fog weather is driven by update_fog_effect
+            return
+        lut = _WEATHER_VISUALS.get(self.current_weather)
+        if lut is None:
+            density, color, light_factor = _CLEAR_VISUALS
         else:
-            density = 0.0
-            color = VBase4(1, 1, 1, 1)
-            light_factor = 1.0
+            strength = min(max(self.weather_strength, 0.0), 1.0)
+            density, color, light_factor = lut[int(strength * _VISUAL_LUT_STEPS + 0.5)]
 
-        self.fog.setExpDensity(density)
-        self.fog.setColor(color)
-        self.ambient_light.setColor(VBase4(light_factor, light_factor, light_factor, 1))
+        self._set_fog(density, color)
+        self._set_ambient(light_factor)
+
+    def _set_fog(self, density, color):
+        """Send fog density and (r, g, b) color to Panda, skipping changes too small to see."""
+        sent = self._sent_density
+        if abs(density - sent) > _FOG_DENSITY_EPSILON or (density == 0.0 and sent != 0.0):
+            self.fog.setExpDensity(density)
+            self._sent_density = density
+            self._weather_pta[0] = density
+        sent = self._sent_fog_color
+        if (abs(color[0] - sent[0]) > _COLOR_EPSILON or abs(color[1] - sent[1]) > _COLOR_EPSILON
+                or abs(color[2] - sent[2]) > _COLOR_EPSILON):
+            self.fog.setColor(color[0], color[1], color[2])
+            self._sent_fog_color = color
+            self._weather_pta[1] = color[0]
+            self._weather_pta[2] = color[1]
+            self._weather_pta[3] = color[2]
+
+    def _set_ambient(self, level):
+        """Set the gray weather ambient light level, skipping changes too small to see."""
+        if abs(level - self._sent_ambient) > _COLOR_EPSILON:
+            self.ambient_light.setColor(VBase4(level, level, level, 1))
+            self._sent_ambient = level
+            self._weather_pta[4] = level
 
     def start_rain(self):
         """Start rain weather effect."""
@@ -323,6 +692,10 @@ class WeatherSystem:
         if self._precip_particles:
             self._precip_particles.stop()
             self._precip_particles = None
+        for particles in self._precip_pool.values():
+            particles.stop()
+        self._precip_pool.clear()
+        self.particles_root.removeNode()
         if self._owns_ambient and hasattr(self, 'light_np'):
             try:
                 self.render.clearLight(self.light_np)
@@ -333,19 +706,46 @@ class WeatherSystem:
         self._owns_fog = False
 
 
-# Weather presets
-WEATHER_PRESETS = {
-    'clear': {'visibility': 1000, 'temperature': 25, 'precipitation': 0},
-    'partly_cloudy': {'visibility': 800, 'temperature': 22, 'precipitation': 0.1},
-    'overcast': {'visibility': 500, 'temperature': 18, 'precipitation': 0.2},
-    'fog': {'visibility': 200, 'temperature': 15, 'precipitation': 0.3},
-    'rain': {'visibility': 300, 'temperature': 14, 'precipitation': 0.8},
-    'snow': {'visibility': 250, 'temperature': 5, 'precipitation': 0.7},
-    'storm': {'visibility': 150, 'temperature': 12, 'precipitation': 0.9}
-}
+class WeatherKind(IntEnum):
+    """Weather types, in the order of their presets."""
+    CLEAR = 0
+    PARTLY_CLOUDY = 1
+    OVERCAST = 2
+    FOG = 3
+    RAIN = 4
+    SNOW = 5
+    STORM = 6
+
+
+WeatherPreset = namedtuple('WeatherPreset', 'visibility temperature precipitation')
+
+# Weather presets, indexed by WeatherKind
+_PRESETS = (
+    WeatherPreset(1000, 25, 0.0),
+    WeatherPreset(800, 22, 0.1),
+    WeatherPreset(500, 18, 0.2),
+    WeatherPreset(200, 15, 0.3),
+    WeatherPreset(300, 14, 0.8),
+    WeatherPreset(250, 5, 0.7),
+    WeatherPreset(150, 12, 0.9),
+)
+
+# The same presets as one (kinds, 3) float32 array for blending during transitions
+_PRESET_ARRAY = np.array(_PRESETS, dtype=np.float32)
+
+_WEATHER_KINDS = {kind.name.lower(): kind for kind in WeatherKind}
+
+
+def get_preset(weather):
+    """Return the preset for a WeatherKind or a weather name such as 'rain'."""
+    if isinstance(weather, str):
+        weather = _WEATHER_KINDS[weather]
+    return _PRESETS[weather]
 
-# Ensure WeatherPresets is defined
-WeatherPresets = WEATHER_PRESETS
 
-# Backwards-compatible alias for tests and external modules
-PRESETS = WEATHER_PRESETS
+# Read-only name-keyed view of the presets for existing callers; the
+# WeatherPresets and PRESETS aliases are the same object
+WEATHER_PRESETS: Final = MappingProxyType({
+    name: MappingProxyType(_PRESETS[kind]._asdict()) for name, kind in _WEATHER_KINDS.items()
+})
+WeatherPresets = PRESETS = WEATHER_PRESETS
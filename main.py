@@ -6,16 +6,9 @@ Initializes the game engine and starts the main game loop.
 
 import logging
 from direct.showbase.ShowBase import ShowBase
-from panda3d.core import WindowProperties
+from panda3d.core import WindowProperties, RenderState, RenderAttrib, DepthTestAttrib, DepthWriteAttrib
+from config import GRAPHICS_CONFIG, ADVANCED_GRAPHICS
 from core.game import Game
-try:
-    from graphics.post_processing import PostProcessing, CinematicEffects
-    from graphics.settings_manager import create_optimized_graphics
-except ImportError:
-    # Handle cases where graphics modules are incomplete
-    PostProcessing = None
-    CinematicEffects = None
-    create_optimized_graphics = None
 
 class MainApp(ShowBase):
     """Main application class that initializes Panda3D and starts the game."""
@@ -36,10 +29,7 @@ class MainApp(ShowBase):
             self.camLens.setNear(0.1)  # Closer near clip
         
         # Initialize graphics systems
-        if create_optimized_graphics is not None:
-            self.graphics_manager = create_optimized_graphics(self)
-        else:
-            self.graphics_manager = None
+        self.graphics_manager = None
         self.setup_post_processing()
         
         # PROPER render-to-2D separation to prevent UI artifacts
@@ -51,8 +41,12 @@ class MainApp(ShowBase):
         # Set up proper render-to-2D separation with explicit sorting
         # Create a proper render bin for 3D scene first
         if hasattr(self, 'render'):
-            self.render.setDepthTest(True)  # Enable depth test for 3D
-            self.render.setDepthWrite(True)  # Enable depth writing for 3D
+            # Enable depth test and depth writing for 3D in one state change
+            scene_state = RenderState.make(
+                DepthTestAttrib.make(RenderAttrib.MLess),
+                DepthWriteAttrib.make(DepthWriteAttrib.MOn),
+            )
+            self.render.setState(self.render.getState().compose(scene_state))
             
         # Set up render2d with proper bin sorting for UI - make render2d render BEFORE aspect2d
         self.render2d.setBin('fixed', 59)  # UI renders first (lower priority number = renders first)
@@ -71,29 +65,38 @@ class MainApp(ShowBase):
         
     def setup_post_processing(self):
         """Set up post-processing effects for photorealistic rendering."""
-        if PostProcessing is None or CinematicEffects is None:
+        # Imported here so the rendering stack only loads when it is set up
+        try:
+            from graphics.post_processing import PostProcessing, CinematicEffects
+            from graphics.settings_manager import create_optimized_graphics
+        except ImportError:
+            # Handle cases where graphics modules are incomplete
             logging.warning("Post-processing modules not available")
             return
 
-        from config import GRAPHICS_CONFIG, ADVANCED_GRAPHICS
+        self.graphics_manager = create_optimized_graphics(self)
 
-        self.post_processing = PostProcessing(self)
         self.cinematic = CinematicEffects(self)
 
-        # Apply graphics settings
-        if GRAPHICS_CONFIG['use_bloom']:
-            self.post_processing.enable_bloom(ADVANCED_GRAPHICS['bloom_intensity'])
+        # The offscreen scene pass is only built when an effect renders through it
+        self.post_processing = None
+        if GRAPHICS_CONFIG['use_bloom'] or GRAPHICS_CONFIG['fxaa'] or GRAPHICS_CONFIG['use_ssao']:
+            self.post_processing = PostProcessing(self)
 
-        if GRAPHICS_CONFIG['fxaa']:
-            self.post_processing.enable_fxaa()
+            # Apply graphics settings
+            if GRAPHICS_CONFIG['use_bloom']:
+                self.post_processing.enable_bloom(ADVANCED_GRAPHICS['bloom_intensity'])
 
-        if GRAPHICS_CONFIG['use_ssao']:
-            self.post_processing.enable_ssao(ADVANCED_GRAPHICS['ssao_radius'])
+            if GRAPHICS_CONFIG['fxaa']:
+                self.post_processing.enable_fxaa()
+
+            if GRAPHICS_CONFIG['use_ssao']:
+                self.post_processing.enable_ssao(ADVANCED_GRAPHICS['ssao_radius'])
+
+            logging.info("High-quality post-processing enabled")
 
         # Enable vignette for cinematic look
         self.cinematic.add_vignette(0.18)
-        
-        logging.info("High-quality post-processing enabled")
 
 def main():
     """Main function to run the application."""
@@ -102,7 +105,6 @@ def main():
         app.run()
     except Exception as e:
         # Log any errors that occur during runtime
-        import logging
         logging.error(f"Game crashed with error: {e}")
         raise
 
@@ -4,5 +4,6 @@ Handles collision detection, ballistics, and physics simulations.
 """
 
 from .collision import CollisionManager, Projectile
+from .pool import ProjectilePool
 
-__all__ = ['CollisionManager', 'Projectile']
\ No newline at end of file
+__all__ = ['CollisionManager', 'Projectile', 'ProjectilePool']
\ No newline at end of file
@@ -0,0 +1,79 @@
+"""
+Optional Numba-compiled kernels for the projectile arrays of CollisionManager.
+`step` and `hit_test` are None when Numba is not installed; callers fall back
+to NumPy and the Panda3D collision traverser.
+"""
+
+import math
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+if numba is not None:
+    @numba.njit(parallel=True, cache=True, fastmath=True, nogil=True)
+    def step(pos, prev, dir_, speed, dist, active, max_range, dt):
+        """Advance active projectiles by dt, saving the old positions in `prev`.
+
+        `pos`, `prev` and `dir_` are (N, 3) float32; the rest are length N.
+        Projectiles that reach `max_range` are marked inactive.
+        """
+        for i in numba.prange(pos.shape[0]):
+            prev[i, 0] = pos[i, 0]
+            prev[i, 1] = pos[i, 1]
+            prev[i, 2] = pos[i, 2]
+            if not active[i]:
+                continue
+            move = speed[i] * dt
+            pos[i, 0] += dir_[i, 0] * move
+            pos[i, 1] += dir_[i, 1] * move
+            pos[i, 2] += dir_[i, 2] * move
+            dist[i] += move
+            if dist[i] >= max_range[i]:
+                active[i] = False
+
+    @numba.njit(parallel=True, cache=True, fastmath=True, nogil=True)
+    def hit_test(pos_prev, pos_new, active, animal_pos, animal_radius, out_hits):
+        """Swept test of each projectile segment against the animal spheres.
+
+        Writes the index of the first sphere hit along the segment
+        `pos_prev[i] -> pos_new[i]` into `out_hits[i]`, or -1 for a miss.
+        """
+        for i in numba.prange(pos_new.shape[0]):
+            out_hits[i] = -1
+            if not active[i]:
+                continue
+            ax = pos_prev[i, 0]
+            ay = pos_prev[i, 1]
+            az = pos_prev[i, 2]
+            dx = pos_new[i, 0] - ax
+            dy = pos_new[i, 1] - ay
+            dz = pos_new[i, 2] - az
+            a = dx * dx + dy * dy + dz * dz
+            best_t = 2.0
+            for j in range(animal_pos.shape[0]):
+                fx = ax - animal_pos[j, 0]
+                fy = ay - animal_pos[j, 1]
+                fz = az - animal_pos[j, 2]
+                c = fx * fx + fy * fy + fz * fz - animal_radius[j] * animal_radius[j]
+                if c <= 0.0:
+                    # Segment starts inside the sphere
+                    t = 0.0
+                elif a > 0.0:
+                    b = 2.0 * (fx * dx + fy * dy + fz * dz)
+                    disc = b * b - 4.0 * a * c
+                    if disc < 0.0:
+                        continue
+                    t = (-b - math.sqrt(disc)) / (2.0 * a)
+                    if t < 0.0 or t > 1.0:
+                        continue
+                else:
+                    continue
+                if t < best_t:
+                    best_t = t
+                    out_hits[i] = j
+else:
+    step = None
+    hit_test = None
@@ -5,42 +5,133 @@ Handles collision detection between projectiles and game objects.
 """
 
 import logging
-from typing import List, Dict, Callable, TYPE_CHECKING
-from panda3d.core import CollisionTraverser, CollisionHandlerQueue, CollisionNode, CollisionSphere, BitMask32, Point3, Vec3
+import weakref
+from typing import List, Dict, Callable, Optional, Tuple, TYPE_CHECKING
+import numpy as np
+from panda3d.core import CollisionTraverser, CollisionHandlerQueue, CollisionNode, CollisionSphere, CollisionSegment, BitMask32, NodePath, Point3, Vec3
+from physics._kernels import step as _step_kernel, hit_test as _hit_test_kernel
+from physics.broadphase import CELL_SIZE_PER_RADIUS, UniformGrid
 
 if TYPE_CHECKING:
     from animals.animal import Animal
 
+# Spatial hash broad-phase: below this many animals a full traversal is cheaper
+BROAD_PHASE_MIN_ANIMALS = 32
+ANIMAL_COLLISION_RADIUS = 1.0
+
+# Length of the forward probe a projectile tests before its first step
+PROJECTILE_PROBE_LENGTH = 0.1
+
+# Projectile collision nodes created up front and recycled between shots
+PROJECTILE_POOL_SIZE = 256
+
+# Projectiles stop this close to max_range to absorb floating-point drift
+RANGE_EPSILON = 0.001
+
+
+def _segment_sphere_hits(pos_prev: np.ndarray, pos_new: np.ndarray, active: np.ndarray,
+                         centers: np.ndarray, radii: np.ndarray) -> np.ndarray:
+    """NumPy twin of the ``hit_test`` kernel, broadcast over all pairs.
+
+    Returns, per projectile segment, the row of the first sphere it enters,
+    or -1 for a miss.
+    """
+    d = pos_new - pos_prev
+    f = pos_prev[:, None, :] - centers[None, :, :]
+    a = np.einsum('pk,pk->p', d, d)[:, None]
+    b = 2.0 * np.einsum('pak,pk->pa', f, d)
+    c = np.einsum('pak,pak->pa', f, f) - (radii * radii)[None, :]
+    disc = b * b - 4.0 * a * c
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = (-b - np.sqrt(np.maximum(disc, 0.0))) / (2.0 * a)
+    inside = c <= 0.0
+    hit = inside | ((disc >= 0.0) & (a > 0.0) & (t >= 0.0) & (t <= 1.0))
+    hit &= active[:, None]
+    t = np.where(inside, 0.0, np.where(hit, t, np.inf))
+    first = t.argmin(axis=1)
+    return np.where(hit.any(axis=1), first, -1)
+
 
 class Projectile:
-    """Represents a projectile (bullet) in the collision system."""
+    """Represents a projectile (bullet) in the collision system.
+
+    Projectiles have no finalizer. They are released explicitly, through
+    CollisionManager.remove_projectile followed by ProjectilePool.release or
+    cleanup(), and pooled instances are reused rather than collected.
+    """
+
+    def __init__(self, position: Optional[Point3] = None, direction: Optional[Vec3] = None,
+                 speed: float = 100.0, damage: float = 25.0):
+        self.collision_np = None
+        self.collision_node = None
+        self.collision_segment = None
+
+        # Row in the owning CollisionManager's projectile arrays
+        self._manager = None
+        self._slot = -1
+
+        if position is None:
+            # Pooled instance, armed later by reset()
+            self.reset(Point3(0, 0, 0), Vec3(0, 1, 0), speed, damage)
+            self.active = False
+        else:
+            self.reset(position, direction, speed, damage)
 
-    def __init__(self, position: Point3, direction: Vec3, speed: float = 100.0, damage: float = 25.0):
-        self.position = position
+    def reset(self, position: Point3, direction: Vec3, speed: float = 100.0,
+              damage: float = 25.0) -> 'Projectile':
+        """Arm the projectile for a new shot and return it."""
+        self._position = Point3(position)
         self.direction = direction.normalized()
         self.speed = speed
         self.damage = damage
         self.distance_traversed = 0.0
         self.max_range = 500.0
         self.active = True
-        self.collision_np = None
-        self.collision_node = None
-        self.collision_id = None
+
+        # Direction and speed are fixed for the projectile's lifetime, so the
+        # per-second displacement and the time to reach max_range are too
+        self.velocity = self.direction * speed
+        self._range_time = (self.max_range - RANGE_EPSILON) / speed if speed > 0 else float('inf')
+        self._time_alive = 0.0
+        return self
+
+    @property
+    def position(self) -> Point3:
+        """Current position; read from the manager's arrays while registered."""
+        manager = self._manager
+        if manager is None:
+            return self._position
+        return Point3(*manager.projectile_pos[self._slot].tolist())
+
+    @position.setter
+    def position(self, value: Point3):
+        manager = self._manager
+        if manager is None:
+            self._position = value
+        else:
+            manager.projectile_pos[self._slot] = (value.x, value.y, value.z)
 
     def update(self, dt: float) -> bool:
         """Update projectile position. Returns False if projectile should be removed."""
         if not self.active:
             return False
 
-        # Use epsilon for floating-point precision
-        EPSILON = 0.001
-        
-        move_distance = self.speed * dt
-        self.position += self.direction * self.speed * dt
-        self.distance_traversed += move_distance
+        manager = self._manager
+        if manager is not None:
+            # Already stepped in bulk by CollisionManager.step_projectiles
+            slot = self._slot
+            self.distance_traversed = float(manager.projectile_dist[slot])
+            if not manager.projectile_active[slot]:
+                self.active = False
+                return False
+            return True
+
+        self._position += self.velocity * dt
+        self._time_alive += dt
+        self.distance_traversed = self._time_alive * self.speed
 
         # Check if projectile exceeded max range with epsilon for precision
-        if self.distance_traversed >= self.max_range - EPSILON:
+        if self._time_alive >= self._range_time:
             self.active = False
             return False
 
@@ -49,20 +140,16 @@ class Projectile:
     def cleanup(self):
         """Clean up projectile resources."""
         # Clean up collision node if it exists
-        if hasattr(self, 'collision_np') and self.collision_np:
+        if self.collision_np is not None:
             try:
-                if hasattr(self.collision_np, 'removeNode'):
-                    self.collision_np.removeNode()
-                self.collision_np = None
+                self.collision_np.removeNode()
             except Exception as e:
                 logging.debug(f"Collision cleanup error: {e}")
-                
-        # Clear all references
-        for attr in ['collision_node', 'collision_id']:
-            if hasattr(self, attr):
-                setattr(self, attr, None)
+            self.collision_np = None
 
-    # __del__ removed — dangerous with Panda3D reference cycles, use cleanup() explicitly
+        # Clear all references
+        self.collision_node = None
+        self.collision_segment = None
 
 
 class CollisionManager:
@@ -71,20 +158,83 @@ class CollisionManager:
     def __init__(self, app):
         """Initialize collision manager with Panda3D application."""
         self.app = app
+        # Resolved once; update() does no per-frame attribute probing
+        render = getattr(app, 'render', None)
+        self._render = render if isinstance(render, NodePath) else None
         self.traverser = CollisionTraverser('collision_manager')
         self.handler = CollisionHandlerQueue()
+
+        # Every collider lives under one root that the traverser walks instead
+        # of render, so terrain, foliage and the player are never visited.
+        # Both subtrees stay at the identity transform: projectile segments
+        # are written in world space and animal spheres are moved to their
+        # animal's world position before each traversal.
+        self.collider_root = None
+        self.projectile_root = None
+        self.animal_root = None
+        if self._render is not None:
+            self.collider_root = self._render.attachNewNode('collider_root')
+            self.projectile_root = self.collider_root.attachNewNode('projectile_collisions')
+            self.animal_root = self.collider_root.attachNewNode('animal_collisions')
         
         # Collision masks
         self.PROJECTILE_MASK = BitMask32.bit(1)
         self.ANIMAL_MASK = BitMask32.bit(2)
         self.TERRAIN_MASK = BitMask32.bit(3)
 
-        # Object mappings for collision detection
-        self.animals: Dict[str, 'Animal'] = {}
-        self.projectiles: Dict[str, 'Projectile'] = {}
+        # One sphere shared by every animal collision node; Panda3D holds
+        # solids by reference and never mutates them during traversal
+        self._animal_sphere = CollisionSphere(0, 0, 0, ANIMAL_COLLISION_RADIUS)
+
+        # Idle projectile collision NodePaths, detached from the scene graph;
+        # the traverser skips colliders outside the graph it walks
+        self._projectile_pool: List[NodePath] = []
+        if self.projectile_root is not None:
+            self._projectile_pool = [self._make_projectile_np() for _ in range(PROJECTILE_POOL_SIZE)]
+
+        # Object mappings for collision detection, keyed by id(); animals are
+        # held weakly so ones dropped by the game without remove_animal go away
+        self.animals: 'weakref.WeakValueDictionary[int, Animal]' = weakref.WeakValueDictionary()
+        self.projectiles: Dict[int, 'Projectile'] = {}
+
+        # Projectile state as structure-of-arrays, stepped in one batch per
+        # frame; rows [0, projectile_count) are live, in _projectile_slots order
+        self.projectile_count = 0
+        self._active_projectile_count = 0
+        self._projectile_slots: List['Projectile'] = []
+        # Each row's collision segment, written directly after every step
+        self._projectile_segments: List[CollisionSegment] = []
+        self._allocate_projectile_arrays(64)
+
+        # Animal rows and their float32 radii, rebuilt only when animals are
+        # added, removed or collected; radii default to ANIMAL_COLLISION_RADIUS
+        # and are overridden by an animal's collision_radius. Rows hold the
+        # animals' keys in self.animals, never the animals themselves, so the
+        # snapshot does not keep dropped animals alive.
+        self._animal_row_keys: List[int] = []
+        self._animal_radii: Dict[int, float] = {}
+        # The model NodePath each animal's position is read from, in row
+        # order alongside _animal_row_keys
+        self._animal_nodes: Dict[int, NodePath] = {}
+        self._animal_row_nodes: List[NodePath] = []
+        self._animal_rows_stale = True
+        self.animal_radius = np.empty(0, np.float32)
+        self._max_animal_radius = ANIMAL_COLLISION_RADIUS
+
+        # Animal positions and float32 bounding boxes, refreshed each update
+        # that tests against them; the grid buckets the boxes by cell
+        self.animal_pos = np.empty((0, 3), np.float32)
+        self.animal_aabb_min = np.empty((0, 3), np.float32)
+        self.animal_aabb_max = np.empty((0, 3), np.float32)
+        self.grid = UniformGrid(CELL_SIZE_PER_RADIUS * ANIMAL_COLLISION_RADIUS)
         
+        # Contacts found this update, processed once detection has finished
+        self._pending_hits: List[Tuple['Projectile', 'Animal']] = []
+
         # Hit callbacks
         self.hit_callbacks: List[Callable[['Projectile', 'Animal'], None]] = []
+        # Snapshot iterated per hit; rebuilt whenever the list changes
+        self._hit_callbacks_tuple: Tuple[Callable[['Projectile', 'Animal'], None], ...] = ()
         
         # Reference to game for context
         self.game = None
@@ -98,30 +248,65 @@ class CollisionManager:
         if not animal:
             return
             
+        animal_node = getattr(animal, 'node', None)
+        if not animal_node:
+            return
+
+        # Validated once here so hit handling can call these without probing
+        if not (callable(getattr(animal, 'is_dead', None)) and callable(getattr(animal, 'take_damage', None))):
+            logging.warning(f"Not adding {type(animal).__name__} to collision detection: missing is_dead/take_damage")
+            return
+
         try:
             # Check if animal already has collision node
-            if hasattr(animal, 'collision_np') and animal.collision_np:
+            if getattr(animal, 'collision_np', None) is not None:
                 self.remove_animal(animal)
-                
-            # Create collision node for animal
-            collision_node = CollisionNode(f"animal_collision_{id(animal)}")
-            collision_node.addSolid(CollisionSphere(0, 0, 0, 1.0))  # Simple sphere collision
-            collision_node.setFromCollideMask(self.PROJECTILE_MASK)
-            collision_node.setIntoCollideMask(self.ANIMAL_MASK)
-
-            # Attach to animal node and set Python tag
-            if hasattr(animal, 'node') and animal.node:
-                collision_np = animal.node.attachNewNode(collision_node)
-                collision_np.setPythonTag('animal', animal)
-                self.traverser.addCollider(collision_np, self.handler)
-                
-                # Store reference on animal object AND in dictionary
-                animal.collision_np = collision_np
-                self.animals[str(id(animal))] = animal
-                
+
+            radius = float(getattr(animal, 'collision_radius', ANIMAL_COLLISION_RADIUS))
+
+            # Create collision node for animal; animals are only ever hit, so
+            # they are into-only and not registered with the traverser. The
+            # sphere only follows its animal while the manager traverses, so
+            # its into mask stays off at all other times; otherwise other
+            # traversers over render would collide with it wherever it was
+            # last left.
+            collision_node = CollisionNode('animal_collision')
+            if radius == ANIMAL_COLLISION_RADIUS:
+                collision_node.addSolid(self._animal_sphere)
+            else:
+                collision_node.addSolid(CollisionSphere(0, 0, 0, radius))
+            collision_node.setFromCollideMask(BitMask32.allOff())
+            collision_node.setIntoCollideMask(BitMask32.allOff())
+
+            # Attach under the animal collider root; the tag refers to the
+            # animal weakly so the scene graph does not keep it alive, and
+            # the collider is dropped with it if remove_animal is never called
+            if self.animal_root is not None:
+                collision_np = self.animal_root.attachNewNode(collision_node)
+            else:
+                collision_np = animal_node.attachNewNode(collision_node)
+            collision_np.setPythonTag('animal', weakref.ref(
+                animal, lambda _ref, key=id(animal), collider=collision_np: self._forget_animal(key, collider)))
+
+            # Store reference on animal object AND in dictionary
+            animal.collision_np = collision_np
+            self.animals[id(animal)] = animal
+            self._animal_radii[id(animal)] = radius
+            self._animal_nodes[id(animal)] = animal_node
+            self._animal_rows_stale = True
+
         except Exception as e:
             logging.error(f"Error adding animal to collision detection: {e}")
 
+    def _forget_animal(self, key: int, collision_np: NodePath):
+        """Drop the bookkeeping of an animal collected without remove_animal."""
+        self._animal_radii.pop(key, None)
+        self._animal_nodes.pop(key, None)
+        self._animal_rows_stale = True
+        # Clearing the tag breaks the node -> weakref -> callback cycle
+        collision_np.clearPythonTag('animal')
+        collision_np.removeNode()
+
     def remove_animal(self, animal: 'Animal'):
         """Remove an animal from collision detection."""
         if not animal:
@@ -129,57 +314,61 @@ class CollisionManager:
             
         try:
             # Remove from tracking
-            animal_id = str(id(animal))
-            if animal_id in self.animals:
-                del self.animals[animal_id]
-                
+            self.animals.pop(id(animal), None)
+            self._animal_radii.pop(id(animal), None)
+            self._animal_nodes.pop(id(animal), None)
+            self._animal_rows_stale = True
+
             # Remove collision node
-            if hasattr(animal, 'collision_np') and animal.collision_np:
+            collision_np = getattr(animal, 'collision_np', None)
+            if collision_np is not None:
                 try:
-                    # Remove from traverser
-                    if hasattr(self.traverser, 'removeCollider'):
-                        self.traverser.removeCollider(animal.collision_np)
-                        
-                    # Remove the node
-                    if hasattr(animal.collision_np, 'removeNode'):
-                        animal.collision_np.removeNode()
-                        
-                    # Clear collision reference
-                    if hasattr(animal, 'collision_np'):
-                        delattr(animal, 'collision_np')
-                        
+                    collision_np.clearPythonTag('animal')
+                    collision_np.removeNode()
                 except Exception as e:
                     logging.error(f"Error removing animal collision node: {e}")
-                    
+                animal.collision_np = None
+
         except Exception as e:
             logging.error(f"Error in remove_animal: {e}")
             raise
 
+    def _make_projectile_np(self) -> NodePath:
+        """Create a detached projectile collision NodePath registered with the traverser."""
+        collision_node = CollisionNode('projectile_collision')
+        # Each node owns its segment, rewritten every step; segments can
+        # only be "from" solids, so the node is never collided into
+        segment = CollisionSegment(0, 0, 0, 0, PROJECTILE_PROBE_LENGTH, 0)
+        collision_node.addSolid(segment)
+        collision_node.setFromCollideMask(self.ANIMAL_MASK)
+        collision_node.setIntoCollideMask(BitMask32.allOff())
+        collision_np = NodePath(collision_node)
+        # getSolid() hands back a const solid, so keep the writable one
+        collision_np.setPythonTag('segment', segment)
+        self.traverser.addCollider(collision_np, self.handler)
+        return collision_np
+
     def add_projectile(self, projectile: 'Projectile'):
         """Add a projectile to collision detection."""
-        if not projectile:
+        if not projectile or self.projectile_root is None:
             return
-            
+
         try:
-            # Set up collision node and Python tag
-            # Create collision node for projectile
-            collision_node = CollisionNode(f"projectile_collision_{id(projectile)}")
-            collision_node.addSolid(CollisionSphere(0, 0, 0, 0.1))  # Small sphere for projectile
-            collision_node.setFromCollideMask(self.ANIMAL_MASK)
-            collision_node.setIntoCollideMask(self.PROJECTILE_MASK)
-            
-            projectile.collision_node = collision_node
-            
-            # Attach to render and set Python tag
-            if hasattr(self.app, 'render'):
-                projectile.collision_np = self.app.render.attachNewNode(collision_node)
-                projectile.collision_np.setPythonTag('projectile', projectile)
-                self.traverser.addCollider(projectile.collision_np, self.handler)
-                
-                # Add to tracking
-                projectile.collision_id = str(id(projectile))
-                self.projectiles[projectile.collision_id] = projectile
-                
+            # Take a pooled collision node and attach it under the projectile
+            # root; a projectile that is already spent stays detached
+            pool = self._projectile_pool
+            collision_np = pool.pop() if pool else self._make_projectile_np()
+            if projectile.active:
+                collision_np.reparentTo(self.projectile_root)
+            collision_np.setPythonTag('projectile', projectile)
+            projectile.collision_np = collision_np
+            projectile.collision_node = collision_np.node()
+            projectile.collision_segment = collision_np.getPythonTag('segment')
+
+            # Add to tracking
+            self.projectiles[id(projectile)] = projectile
+            self._add_projectile_row(projectile)
+
         except Exception as e:
             logging.error(f"Error adding projectile to collision detection: {e}")
 
@@ -190,97 +379,344 @@ class CollisionManager:
             
         try:
             # Remove from tracking
-            if hasattr(projectile, 'collision_id') and projectile.collision_id:
-                projectile_id = projectile.collision_id
-                if projectile_id in self.projectiles:
-                    del self.projectiles[projectile_id]
-                    
-            # Remove collision node from traverser
-            if projectile.collision_np:
-                try:
-                    colliders = self.traverser.getColliders()
-                    if projectile.collision_np in colliders:
-                        self.traverser.removeCollider(projectile.collision_np)
-                except Exception as e:
-                    logging.debug(f"Traverser removal error: {e}")
-                    
-                try:
-                    if projectile.collision_np and not projectile.collision_np.isEmpty():
-                        projectile.collision_np.removeNode()
-                except Exception:
-                    pass
-                    
+            self.projectiles.pop(id(projectile), None)
+            if projectile._manager is self:
+                self._remove_projectile_row(projectile)
+
+            # Detach the collision node and return it to the pool; it stays
+            # registered with the traverser for the next shot
+            collision_np = projectile.collision_np
+            if collision_np is not None:
+                if not collision_np.isEmpty():
+                    collision_np.clearPythonTag('projectile')
+                    collision_np.detachNode()
+                    self._projectile_pool.append(collision_np)
                 projectile.collision_np = None
-                
+                projectile.collision_node = None
+                projectile.collision_segment = None
+
         except Exception as error:
             logging.error(f"Error in remove_projectile: {error}")
             raise
 
-    def update(self):
-        """Update collision detection and process collisions."""
+    def _allocate_projectile_arrays(self, capacity: int):
+        """(Re)allocate the projectile arrays, keeping the live rows."""
+        n = self.projectile_count
+        arrays = (
+            np.empty((capacity, 3), np.float32),  # projectile_pos
+            np.empty((capacity, 3), np.float32),  # projectile_dir
+            np.empty(capacity, np.float32),  # projectile_speed
+            np.empty(capacity, np.float32),  # projectile_dist
+            np.empty(capacity, np.float32),  # projectile_range
+            np.zeros(capacity, np.bool_),  # projectile_active
+        )
+        if n:
+            for new, old in zip(arrays, self._projectile_arrays()):
+                new[:n] = old[:n]
+        (self.projectile_pos, self.projectile_dir, self.projectile_speed,
+         self.projectile_dist, self.projectile_range, self.projectile_active) = arrays
+        # Positions before the latest step, for swept hit tests
+        self._projectile_prev = np.empty((capacity, 3), np.float32)
+
+    def _projectile_arrays(self):
+        return (self.projectile_pos, self.projectile_dir, self.projectile_speed,
+                self.projectile_dist, self.projectile_range, self.projectile_active)
+
+    def _add_projectile_row(self, projectile: 'Projectile'):
+        """Append a row for the projectile and hand its state to the arrays."""
+        n = self.projectile_count
+        if n == len(self.projectile_speed):
+            self._allocate_projectile_arrays(2 * n)
+        position = projectile.position
+        direction = projectile.direction
+        self.projectile_pos[n] = (position.x, position.y, position.z)
+        self.projectile_dir[n] = (direction.x, direction.y, direction.z)
+        self.projectile_speed[n] = projectile.speed
+        self.projectile_dist[n] = projectile.distance_traversed
+        self.projectile_range[n] = projectile.max_range - RANGE_EPSILON
+        self.projectile_active[n] = projectile.active
+        self._active_projectile_count += bool(projectile.active)
+        self._projectile_slots.append(projectile)
+        self._projectile_segments.append(projectile.collision_segment)
+        projectile._manager = self
+        projectile._slot = n
+        self.projectile_count = n + 1
+        # Until the first step the segment is a short probe ahead of the muzzle
+        segment = projectile.collision_segment
+        segment.setPointA(position)
+        segment.setPointB(position + direction * PROJECTILE_PROBE_LENGTH)
+
+    def _remove_projectile_row(self, projectile: 'Projectile'):
+        """Hand the row back to the projectile and fill the gap with the last row."""
+        slot = projectile._slot
+        self._active_projectile_count -= bool(self.projectile_active[slot])
+        projectile._position = Point3(*self.projectile_pos[slot].tolist())
+        projectile.distance_traversed = float(self.projectile_dist[slot])
+        projectile._manager = None
+        projectile._slot = -1
+
+        last = self.projectile_count - 1
+        if slot != last:
+            for array in self._projectile_arrays():
+                array[slot] = array[last]
+            moved = self._projectile_slots[last]
+            self._projectile_slots[slot] = moved
+            self._projectile_segments[slot] = self._projectile_segments[last]
+            moved._slot = slot
+        self._projectile_slots.pop()
+        self._projectile_segments.pop()
+        self.projectile_count = last
+
+    def _deactivate_projectile(self, projectile: 'Projectile'):
+        projectile.active = False
+        if projectile._manager is self and self.projectile_active[projectile._slot]:
+            self.projectile_active[projectile._slot] = False
+            self._active_projectile_count -= 1
+            # Out of the graph the traverser walks until it is removed
+            projectile.collision_np.detachNode()
+
+    def step_projectiles(self, dt: float):
+        """Advance every registered projectile by dt in one vectorized step."""
+        n = self.projectile_count
+        if not n:
+            return
+        if _step_kernel is not None:
+            _step_kernel(self.projectile_pos[:n], self._projectile_prev[:n], self.projectile_dir[:n],
+                         self.projectile_speed[:n], self.projectile_dist[:n],
+                         self.projectile_active[:n], self.projectile_range[:n], np.float32(dt))
+        else:
+            self._projectile_prev[:n] = self.projectile_pos[:n]
+            active = self.projectile_active[:n]
+            step = self.projectile_speed[:n] * (np.float32(dt) * active)
+            self.projectile_pos[:n] += self.projectile_dir[:n] * step[:, None]
+            dist = self.projectile_dist[:n]
+            dist += step
+            active &= dist < self.projectile_range[:n]
+        active_count = int(np.count_nonzero(self.projectile_active[:n]))
+        if active_count < self._active_projectile_count:
+            # Rows that ran out of range this step are the inactive ones that
+            # still moved; detaching their nodes keeps spent projectiles out
+            # of the traversal while they wait for remove_projectile
+            expired = ~self.projectile_active[:n] & np.any(self._projectile_prev[:n] != self.projectile_pos[:n], axis=1)
+            slots = self._projectile_slots
+            for i in np.flatnonzero(expired).tolist():
+                slots[i].collision_np.detachNode()
+        self._active_projectile_count = active_count
+
+        # Sweep each collision segment over the step just taken, so a fast
+        # projectile cannot pass through an animal between frames; rows that
+        # did not move keep their last segment. The segments are written
+        # straight from the parallel list: the traverser reads each from
+        # solid's own bounds, so no node needs touching.
+        for segment, start, end in zip(self._projectile_segments, self._projectile_prev[:n].tolist(),
+                                       self.projectile_pos[:n].tolist()):
+            if start != end:
+                segment.setPointA(*start)
+                segment.setPointB(*end)
+
+    def update(self, dt: float = 0.0):
+        """Step projectiles, then update collision detection and process collisions.
+
+        With few animals, each projectile's path for the frame is swept
+        against the animal spheres directly (Numba when available, NumPy
+        otherwise) and the traverser is skipped. With many animals, a
+        spatial hash and a float32 AABB test pick the animals near each
+        projectile's step and only those are collidable, for that traversal only.
+        """
         try:
+            self.step_projectiles(dt)
+
+            # Nothing can collide between shots or with no animals around
+            if self._render is None or not self._active_projectile_count or not self.animals:
+                return
+
             # Perform collision detection
-            if hasattr(self.app, 'render') and self.app.render:
-                self.traverser.traverse(self.app.render)
-                
-                # Process collisions
-                for i in range(self.handler.getNumEntries()):
-                    entry = self.handler.getEntry(i)
-
-                    # Get the collision nodes
-                    from_node_path = entry.getFromNodePath()
-                    into_node_path = entry.getIntoPath()
-                    
-                    # Validate that we have valid nodes
-                    if not from_node_path or not into_node_path:
-                        continue
-
-                    # Retrieve projectile and animal from collision nodes
-                    projectile = None
-                    animal = None
-                    
-                    # Try to get projectile from either node
-                    if from_node_path.hasPythonTag('projectile'):
-                        projectile = from_node_path.getPythonTag('projectile')
-                    if into_node_path.hasPythonTag('projectile'):
-                        projectile = into_node_path.getPythonTag('projectile')
-                        
-                    # Try to get animal from either node
-                    if from_node_path.hasPythonTag('animal'):
-                        animal = from_node_path.getPythonTag('animal')
-                    if into_node_path.hasPythonTag('animal'):
-                        animal = into_node_path.getPythonTag('animal')
-
-                    # Validate that we have both objects
-                    if projectile is None or animal is None:
-                        continue
-
-                    # Validate that we have proper objects
-                    if not (hasattr(projectile, 'active') and hasattr(projectile, 'damage')):
-                        continue
-                    if not (hasattr(animal, 'is_dead') and callable(animal.is_dead)):
-                        continue
-                        
-                    # Check if this is a valid collision
-                    if projectile.active and not animal.is_dead():
-                        # Process the collision
-                        self._process_collision(projectile, animal)
-                        # Mark projectile as inactive
-                        projectile.active = False
-                        
+            if len(self.animals) < BROAD_PHASE_MIN_ANIMALS:
+                self._sweep_projectiles()
+            else:
+                self._traverse_broad_phase()
+                self._collect_entries()
+
+            self._drain_hits()
+
         except Exception as e:
             logging.error(f"Collision update error: {e}")
+            self._pending_hits.clear()
             return False
 
+    def _collect_entries(self):
+        """Queue the projectile/animal pair behind each traversal entry."""
+        pending = self._pending_hits
+        for entry in self.handler.getEntries():
+            # Projectiles are the only colliders and animals the only other
+            # nodes under collider_root, so the "from" side always carries the
+            # projectile tag and the "into" side the animal's weak reference;
+            # each accessor builds a new NodePath wrapper, so call each once
+            pending.append((entry.getFromNodePath().getPythonTag('projectile'),
+                            entry.getIntoNodePath().getPythonTag('animal')()))
+
+    def _drain_hits(self):
+        """Apply damage and fire callbacks for the contacts queued this update."""
+        pending = self._pending_hits
+        if not pending:
+            return
+        self._pending_hits = []
+        for projectile, animal in pending:
+            self._handle_hit(projectile, animal)
+
+    def _handle_hit(self, projectile: 'Projectile', animal: 'Animal'):
+        """Validate a projectile/animal contact and process it."""
+        # The animal may have been collected since it was queued. Both
+        # objects were validated when they were added, so no attribute
+        # probing is needed here.
+        if projectile is None or animal is None:
+            return
+
+        # Check if this is a valid collision
+        if projectile.active and not animal.is_dead():
+            # Process the collision
+            self._process_collision(projectile, animal)
+            # Mark projectile as inactive
+            self._deactivate_projectile(projectile)
+
+    def _sweep_projectiles(self):
+        """Sweep each projectile's last step against the animal spheres."""
+        n = self.projectile_count
+        if not n or not self.animals:
+            return
+        animals = self._update_animal_bounds()
+        if _hit_test_kernel is not None:
+            hits = np.empty(n, np.int64)
+            _hit_test_kernel(self._projectile_prev[:n], self.projectile_pos[:n], self.projectile_active[:n],
+                             self.animal_pos, self.animal_radius, hits)
+        else:
+            hits = _segment_sphere_hits(self._projectile_prev[:n], self.projectile_pos[:n],
+                                        self.projectile_active[:n], self.animal_pos, self.animal_radius)
+
+        # Queue rather than process: hit callbacks may remove projectiles and reorder rows
+        slots = self._projectile_slots
+        self._pending_hits.extend((slots[i], animals[hits[i]]) for i in np.flatnonzero(hits >= 0).tolist())
+
+    def _update_animal_bounds(self) -> List['Animal']:
+        """Snapshot the tracked animals' positions and float32 bounding boxes.
+
+        Returns the animals in row order of ``animal_pos``, ``animal_aabb_min``
+        and ``animal_aabb_max``. The boxes are rounded outward by one ulp so
+        float32 error never culls a touching pair.
+        """
+        animals = None
+        tracked = self.animals
+        if not self._animal_rows_stale and len(self._animal_row_keys) == len(tracked):
+            animals = [tracked.get(key) for key in self._animal_row_keys]
+        if animals is None or None in animals:
+            animals = self._rebuild_animal_rows()
+        render = self._render
+        animal_pos = np.empty((len(animals), 3), np.float32)
+        orphaned = None
+        for j, animal_node in enumerate(self._animal_row_nodes):
+            if animal_node.isEmpty():
+                # The model was removed without remove_animal, as
+                # Animal.cleanup() does; the animal can no longer be hit
+                orphaned = orphaned or []
+                orphaned.append(animals[j])
+                continue
+            pos = animal_node.getPos(render)
+            animal_pos[j] = (pos.x, pos.y, pos.z)
+        if orphaned:
+            for animal in orphaned:
+                self.remove_animal(animal)
+            return self._update_animal_bounds()
+        radius = self.animal_radius[:, None]
+        self.animal_pos = animal_pos
+        self.animal_aabb_min = np.nextafter(animal_pos - radius, np.float32(-np.inf))
+        self.animal_aabb_max = np.nextafter(animal_pos + radius, np.float32(np.inf))
+        return animals
+
+    def _rebuild_animal_rows(self) -> List['Animal']:
+        """Fix the animal row order and gather their radii into a float32 array.
+
+        Returns the animals in the new row order.
+        """
+        animals = list(self.animals.values())
+        radii = self._animal_radii
+        nodes = self._animal_nodes
+        self._animal_row_keys = [id(animal) for animal in animals]
+        self._animal_row_nodes = [nodes[key] for key in self._animal_row_keys]
+        self.animal_radius = np.array([radii[key] for key in self._animal_row_keys], np.float32)
+        self._max_animal_radius = float(self.animal_radius.max()) if animals else ANIMAL_COLLISION_RADIUS
+        self.grid.cell_size = CELL_SIZE_PER_RADIUS * self._max_animal_radius
+        self._animal_rows_stale = False
+        return animals
+
+    def _broad_phase_candidates(self) -> List[int]:
+        """Rows of the animals whose bounds overlap any active projectile's last step.
+
+        Tests against the bounds from the latest _update_animal_bounds. The
+        uniform grid narrows the animals to those bucketed in cells the step
+        passes through; the float32 AABB test then drops the ones whose own
+        box misses every step box.
+        """
+        grid = self.grid
+        grid.build(self.animal_aabb_min.tolist(), self.animal_aabb_max.tolist())
+        n = self.projectile_count
+        active = self.projectile_active[:n]
+        prev = self._projectile_prev[:n][active]
+        pos = self.projectile_pos[:n][active]
+        if not len(pos):
+            return []
+        seg_min = np.minimum(prev, pos)
+        seg_max = np.maximum(prev, pos)
+
+        rows = set()
+        for start, end in zip(prev.tolist(), pos.tolist()):
+            grid.query_segment(start, end, rows)
+        if not rows:
+            return []
+
+        rows = np.fromiter(rows, np.intp, len(rows))
+        overlap = np.all((self.animal_aabb_min[rows, None, :] <= seg_max[None, :, :])
+                         & (self.animal_aabb_max[rows, None, :] >= seg_min[None, :, :]), axis=2)
+        return rows[overlap.any(axis=1)].tolist()
+
+    def _traverse_broad_phase(self):
+        """Traverse the projectiles against the broad-phase candidates only.
+
+        Animal colliders are into-only and keep their into mask cleared,
+        so the traverser prunes every non-candidate. Each candidate is moved
+        to its animal's position, since it does not inherit it, and is made
+        collidable for this traversal only.
+        """
+        animals = self._update_animal_bounds()
+        rows = self._broad_phase_candidates()
+        if not rows:
+            self.handler.clearEntries()
+            return
+
+        animal_pos = self.animal_pos.tolist()
+        candidates = [animals[j].collision_np for j in rows]
+        for j, collision_np in zip(rows, candidates):
+            collision_np.setPos(*animal_pos[j])
+            collision_np.node().setIntoCollideMask(self.ANIMAL_MASK)
+        try:
+            self.traverser.traverse(self.collider_root)
+        finally:
+            off = BitMask32.allOff()
+            for collision_np in candidates:
+                collision_np.node().setIntoCollideMask(off)
+
     def _process_collision(self, projectile: 'Projectile', animal: 'Animal'):
         """Process a collision between projectile and animal."""
         try:
             # Apply damage to animal
             animal.take_damage(projectile.damage)
             
-            # Notify callbacks
-            for callback in self.hit_callbacks:
-                callback(projectile, animal)
+            # Notify callbacks; there is usually exactly one
+            callbacks = self._hit_callbacks_tuple
+            if len(callbacks) == 1:
+                callbacks[0](projectile, animal)
+            else:
+                for callback in callbacks:
+                    callback(projectile, animal)
         except Exception as e:
             logging.error(f"Collision processing error: {e}")
             raise
@@ -289,12 +725,14 @@ class CollisionManager:
         """Add a callback function to be called when a projectile hits an animal."""
         if callback not in self.hit_callbacks:
             self.hit_callbacks.append(callback)
+            self._hit_callbacks_tuple = tuple(self.hit_callbacks)
             logging.debug(f"Added hit callback: {callback.__name__ if hasattr(callback, '__name__') else 'anonymous'}")
 
     def remove_hit_callback(self, callback: Callable[['Projectile', 'Animal'], None]):
         """Remove a hit callback function."""
         if callback in self.hit_callbacks:
             self.hit_callbacks.remove(callback)
+            self._hit_callbacks_tuple = tuple(self.hit_callbacks)
             logging.debug(f"Removed hit callback: {callback.__name__ if hasattr(callback, '__name__') else 'anonymous'}")
 
     def cleanup(self):
@@ -302,14 +740,37 @@ class CollisionManager:
         try:
             # Clear callbacks
             self.hit_callbacks.clear()
+            self._hit_callbacks_tuple = ()
             
             # Clear object references
             self.animals.clear()
             self.projectiles.clear()
+            for projectile, row in zip(self._projectile_slots, self.projectile_pos.tolist()):
+                projectile._position = Point3(*row)
+                projectile._manager = None
+                projectile._slot = -1
+            self._projectile_slots.clear()
+            self._projectile_segments.clear()
+            self.projectile_count = 0
+            self._active_projectile_count = 0
             
             # Clear traverser colliders
-            if hasattr(self.traverser, 'clearColliders'):
-                self.traverser.clearColliders()
+            self.traverser.clearColliders()
+            for collision_np in self._projectile_pool:
+                collision_np.removeNode()
+            self._projectile_pool.clear()
+            self.grid.clear()
+            self._animal_row_keys = []
+            self._animal_row_nodes = []
+            self._animal_radii.clear()
+            self._animal_nodes.clear()
+            self._animal_rows_stale = True
+
+            if self.collider_root is not None:
+                self.collider_root.removeNode()
+                self.collider_root = None
+                self.projectile_root = None
+                self.animal_root = None
                 
         except Exception as e:
             logging.error(f"Error during cleanup: {e}")
\ No newline at end of file
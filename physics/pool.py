@@ -0,0 +1,42 @@
+"""
+Object pool for projectiles.
+Recycles Projectile instances between shots so sustained fire does not
+allocate a new object per trigger pull.
+"""
+
+from typing import List, Set
+
+from .collision import Projectile
+
+
+class ProjectilePool:
+    """Fixed set of reusable Projectile instances handed out by acquire()."""
+
+    def __init__(self, size: int = 64):
+        self._free: List[Projectile] = [Projectile() for _ in range(size)]
+        self.active: Set[Projectile] = set()
+
+    def acquire(self) -> Projectile:
+        """Take an idle projectile, growing the pool if every one is in flight.
+
+        The projectile still has to be armed with Projectile.reset().
+        """
+        projectile = self._free.pop() if self._free else Projectile()
+        self.active.add(projectile)
+        return projectile
+
+    def release(self, projectile: Projectile):
+        """Return a projectile to the pool once it is out of the collision manager."""
+        if projectile not in self.active:
+            return
+        self.active.discard(projectile)
+        projectile.cleanup()
+        projectile.active = False
+        self._free.append(projectile)
+
+    def clear(self):
+        """Drop every projectile, idle or in flight."""
+        for projectile in self.active:
+            projectile.cleanup()
+        self.active.clear()
+        self._free.clear()
@@ -4,10 +4,13 @@ Handles player character, controls, and inventory.
 """
 
 import logging
+import math
+import random
 from panda3d.core import Vec3, Point3, CollisionNode, CollisionSphere, CollisionTraverser, CollisionHandlerQueue
 from direct.task import Task
 from typing import List, Optional, Dict
 from physics.collision import CollisionManager, Projectile
+from physics.pool import ProjectilePool
 
 
 class Weapon:
@@ -40,15 +43,17 @@ class Weapon:
         time_since_last_shot = current_time - self.last_shot_time
         return time_since_last_shot >= self.fire_rate - 0.001
 
-    def shoot(self, position: Point3, direction: Vec3, current_time: float) -> Optional[Projectile]:
-        """Attempt to shoot. Returns projectile if successful."""
+    def shoot(self, position: Point3, direction: Vec3, current_time: float,
+              pool: Optional[ProjectilePool] = None) -> Optional[Projectile]:
+        """Attempt to shoot. Returns projectile if successful, taken from pool when given."""
         if not self.can_shoot(current_time):
             return None
 
         self.current_ammo -= 1
         self.last_shot_time = current_time
 
-        return Projectile(position, direction, self.projectile_speed, self.damage)
+        projectile = pool.acquire() if pool is not None else Projectile()
+        return projectile.reset(position, direction, self.projectile_speed, self.damage)
 
     def reload(self, current_time: float) -> bool:
         """Start reloading if not already reloading."""
@@ -269,8 +274,9 @@ class Player:
         # Inventory and weapon system
         self.inventory = Inventory()
         
-        # Projectile list
+        # Projectile list; spent projectiles go back to the pool
         self.projectiles: List[Projectile] = []
+        self.projectile_pool = ProjectilePool()
         
         # Add default weapons
         rifle = Weapon("Hunting Rifle", fire_rate=0.5, damage=25.0, projectile_speed=150.0, max_ammo=10, weapon_type="rifle")
@@ -475,7 +481,6 @@ class Player:
 
     def update(self, dt):
         """Update player position and handle movement with advanced mechanics."""
-        import random
         # Update basic needs (hunger, thirst)
         self._update_basic_needs(dt)
         
@@ -485,22 +490,29 @@ class Player:
         # Update jump and gravity
         self._update_jump_and_gravity(dt)
         
-        # Calculate movement direction based on camera orientation
+        # Calculate movement direction based on camera orientation; the
+        # camera basis is read from Panda3D once per frame
         move_dir = Vec3(0, 0, 0)
         is_moving = False
-
-        if self.camera_node is not None:
-            if self.movement['forward']:
-                move_dir += self.camera_node.getQuat().getForward()
+        camera_node = self.camera_node
+        forward = None
+
+        if camera_node is not None:
+            cam_quat = camera_node.getQuat()
+            forward = cam_quat.getForward()
+            right = cam_quat.getRight()
+            movement = self.movement
+            if movement['forward']:
+                move_dir += forward
                 is_moving = True
-            if self.movement['backward']:
-                move_dir -= self.camera_node.getQuat().getForward()
+            if movement['backward']:
+                move_dir -= forward
                 is_moving = True
-            if self.movement['left']:
-                move_dir -= self.camera_node.getQuat().getRight()
+            if movement['left']:
+                move_dir -= right
                 is_moving = True
-            if self.movement['right']:
-                move_dir += self.camera_node.getQuat().getRight()
+            if movement['right']:
+                move_dir += right
                 is_moving = True
 
         # Apply speed based on sprint and stamina
@@ -534,8 +546,10 @@ class Player:
         # Update recoil recovery
         if self.recoil_pitch > 0:
             self.recoil_pitch = max(0.0, self.recoil_pitch - self.recoil_recovery * dt)
-            if self.camera_node is not None:
-                self.camera_node.setP(self.camera_node.getP() + self.recoil_recovery * dt)
+            if camera_node is not None:
+                camera_node.setP(camera_node.getP() + self.recoil_recovery * dt)
+                # Pitch changed, so the cached forward vector is stale
+                forward = camera_node.getQuat().getForward()
 
         # Update camera shake
         if self.shake_intensity > 0.001:
@@ -549,8 +563,8 @@ class Player:
             self._shake_offset = Vec3(0, 0, 0)
 
         # Update camera position to follow player
-        if self.camera_node is not None:
-            camera_offset = self.camera_node.getQuat().getForward() * -self.camera_distance
+        if camera_node is not None:
+            camera_offset = forward * -self.camera_distance
             camera_offset.setZ(1.5)  # Keep camera at more natural eye level
             camera_pos = self.position + camera_offset + self._shake_offset
             
@@ -559,15 +573,16 @@ class Player:
             if camera_pos.getZ() < terrain_height + 1.5:  # Keep 1.5m above terrain (better visibility)
                 camera_pos.setZ(terrain_height + 1.5)
             
-            self.camera_node.setPos(camera_pos)
+            camera_node.setPos(camera_pos)
 
         # Update audio footsteps if available
         if hasattr(self.app, 'game') and self.app.game and hasattr(self.app.game, 'audio_manager') and self.app.game.audio_manager:
             self.app.game.audio_manager.update_footsteps(dt, self.position, is_moving, self.is_sprinting)
 
         # Basic collision detection
-        if self.collision_traverser is not None and hasattr(self.app, 'render'):
-            self.collision_traverser.traverse(self.app.render)
+        render = getattr(self.app, 'render', None)
+        if self.collision_traverser is not None and render is not None:
+            self.collision_traverser.traverse(render)
             if self.collision_handler.getNumEntries() > 0:
                 # Simple collision response - prevent movement into obstacles
                 self.position -= move_dir
@@ -578,9 +593,9 @@ class Player:
                  
                 if self.model is not None:
                     self.model.setPos(self.position)
-                if self.camera_node is not None:
+                if camera_node is not None:
                     # Re-calculate camera position after collision response
-                    camera_offset = self.camera_node.getQuat().getForward() * -self.camera_distance
+                    camera_offset = forward * -self.camera_distance
                     camera_offset.setZ(1.5)
                     camera_pos = self.position + camera_offset
                     
@@ -589,7 +604,7 @@ class Player:
                     if camera_pos.getZ() < terrain_height + 0.5:
                         camera_pos.setZ(terrain_height + 0.5)
                     
-                    self.camera_node.setPos(camera_pos)
+                    camera_node.setPos(camera_pos)
 
         # Update weapon reload — transfer ammo when reload completes
         if hasattr(self.app, 'taskMgr') and self.app.taskMgr is not None:
@@ -614,7 +629,7 @@ class Player:
 
         # Update collision detection
         if self.collision_manager:
-            self.collision_manager.update()
+            self.collision_manager.update(dt)
 
         # Update projectiles
         self.update_projectiles(dt)
@@ -675,7 +690,6 @@ class Player:
         # Apply accuracy based on weapon and zoom
         accuracy = self.current_weapon.get_accuracy()
         if accuracy < 1.0:
-            import random
             spread = Vec3(
                 random.uniform(-0.5, 0.5) * (1.0 - accuracy),
                 random.uniform(-0.5, 0.5) * (1.0 - accuracy),
@@ -685,7 +699,7 @@ class Player:
             shot_direction.normalize()
 
         # Attempt to shoot — this decrements weapon.current_ammo
-        projectile = self.current_weapon.shoot(shot_origin, shot_direction, current_time)
+        projectile = self.current_weapon.shoot(shot_origin, shot_direction, current_time, self.projectile_pool)
         if projectile:
             self.projectiles.append(projectile)
             self.collision_manager.add_projectile(projectile)
@@ -754,29 +768,31 @@ class Player:
 
 
     def update_projectiles(self, dt: float):
-        """Update all active projectiles with proper memory management."""
-        active_projectiles = []
-
-        for projectile in self.projectiles[:]:
+        """Update all active projectiles with proper memory management.
+
+        Spent projectiles are swap-removed in place: the last projectile
+        fills the gap, so no list is rebuilt each frame and order is not kept.
+        """
+        projectiles = self.projectiles
+        i = len(projectiles) - 1
+        while i >= 0:
+            projectile = projectiles[i]
             try:
-                if projectile.active and projectile.update(dt):
-                    active_projectiles.append(projectile)
-                else:
-                    # Remove from collision manager before cleanup
-                    if self.collision_manager:
-                        self.collision_manager.remove_projectile(projectile)
-                    projectile.cleanup()
+                alive = projectile.active and projectile.update(dt)
             except Exception:
-                # Force cleanup on error
+                alive = False
+
+            if not alive:
+                projectiles[i] = projectiles[-1]
+                projectiles.pop()
+                # Remove from collision manager before recycling
                 try:
                     if self.collision_manager:
                         self.collision_manager.remove_projectile(projectile)
-                    projectile.cleanup()
+                    self.projectile_pool.release(projectile)
                 except Exception:
                     pass
-                continue
-
-        self.projectiles = active_projectiles
+            i -= 1
 
     def get_projectiles(self) -> List[Projectile]:
         """Get list of active projectiles."""
@@ -864,7 +880,6 @@ class Player:
         self._wind_change_timer += dt
         if self._wind_change_timer >= self._wind_change_interval:
             self._wind_change_timer = 0.0
-            import random, math
             angle = random.uniform(0, 2 * math.pi)
             self.wind_direction = Vec3(math.cos(angle), math.sin(angle), 0)
             self.wind_speed = random.uniform(2.0, 12.0)
@@ -966,6 +981,7 @@ class Player:
             except:
                 pass  # Skip problematic projectiles
         self.projectiles.clear()
+        self.projectile_pool.clear()
 
         # Clean up collision manager
         if self.collision_manager: